@@ -0,0 +1,198 @@
+'''coupang 데코레이터의 호출당 오버헤드 측정
+
+네트워크 전송(transport.request)을 고정 응답으로 바꿔치기한 뒤
+명세 생성 -> 서명 -> 전송 -> 반환까지의 순수 파이썬 오버헤드를 잰다.
+데코레이터 오버헤드 = 전체 호출 시간 - API 함수의 명세 생성 시간
+
+비교 기준(이전)으로 Request 파이프라인 도입 전의 분기형 데코레이터
+(legacy_coupang)를 같은 API 함수와 같은 서명 함수에 적용해 함께 잰다.
+GET 은 동일 요청 묶기(SingleFlight) 비용이 더해지므로
+묶기를 끈 클라이언트(coalesce=False)로 호출한 값도 함께 출력한다.
+
+    python benchmarks/dispatch.py [반복횟수]
+'''
+
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# 기본 클라이언트가 현재 디렉터리의 coupang.ini 를 읽으므로 임시 설정 파일 사용
+workdir = tempfile.mkdtemp()
+with open(os.path.join(workdir, 'coupang.ini'), 'w') as fp:
+    fp.write('[DEFAULT]\nSECRETKEY = secret\nACCESSKEY = access\nVENDOR_ID = A00000000\n')
+os.chdir(workdir)
+
+from coupang import common, transport
+from coupang.product import get_products_by_query, update_product_price_by_item
+from coupang.ordersheet import update_ordersheet_status
+
+RESPONSE = {'code': 'SUCCESS', 'message': '', 'data': None}
+
+
+def fake_request(method, url, authorization, body=None, pool=None):
+    return RESPONSE
+
+
+transport.request = fake_request
+
+
+def legacy_send(method, url, authorization, body=None, limiter=None):
+    policy = common.RETRY_POLICY
+    policy.budget.deposit()
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return transport.request(method, url, authorization, body)
+        except Exception as e:
+            if not policy.should_retry(e, attempt):
+                raise
+            time.sleep(policy.delay(e, attempt))
+            attempt += 1
+
+
+def legacy_coupang(f, limiter=None):
+    '''Request 파이프라인 도입 전의 분기형 데코레이터(비교용)
+
+    메서드와 query/body 유무에 따라 분기해 URL 을 만들고 서명한다.
+    서명은 현재의 auth()를 사용해 디스패치 차이만 비교한다.
+    '''
+
+    secretkey, accesskey = 'secret', 'access'
+    base_url = "https://api-gateway.coupang.com"
+
+    def decorated(*args, **kwargs):
+        data = f(*args, **kwargs)
+        response = None
+        try:
+            if data.get('method') == 'PUT':
+                if 'query' in data:
+                    authorization = common.auth(
+                            secretkey, accesskey, data.get('method'),
+                            data.get('path'), data.get('query'))
+                    url = base_url + data.get('path') + "?%s" % data.get('query')
+                    response = legacy_send(
+                            data.get('method'), url, authorization,
+                            limiter=limiter)
+                elif 'body' in data:
+                    authorization = common.auth(
+                            secretkey, accesskey, data.get('method'),
+                            data.get('path'))
+                    url = base_url + data.get('path')
+                    response = legacy_send(
+                            data.get('method'), url, authorization,
+                            data.get('body'), limiter=limiter)
+                else:
+                    authorization = common.auth(
+                            secretkey, accesskey, data.get('method'),
+                            data.get('path'))
+                    url = base_url + data.get('path')
+                    response = legacy_send(
+                            data.get('method'), url, authorization,
+                            limiter=limiter)
+
+            elif data.get('method') == 'GET':
+                if 'query' in data:
+                    authorization = common.auth(
+                            secretkey, accesskey, data.get('method'),
+                            data.get('path'), data.get('query'))
+                    url = base_url + data.get('path') + "?%s" % data.get('query')
+                else:
+                    authorization = common.auth(
+                            secretkey, accesskey, data.get('method'),
+                            data.get('path'))
+                    url = base_url + data.get('path')
+                response = legacy_send(
+                        data.get('method'), url, authorization,
+                        limiter=limiter)
+
+            elif data.get('method') == 'DELETE':
+                authorization = common.auth(
+                        secretkey, accesskey, data.get('method'),
+                        data.get('path'))
+                url = base_url + data.get('path')
+                response = legacy_send(
+                        data.get('method'), url, authorization,
+                        limiter=limiter)
+
+            elif data.get('method') == 'POST':
+                authorization = common.auth(
+                        secretkey, accesskey, data.get('method'),
+                        data.get('path'))
+                url = base_url + data.get('path')
+                response = legacy_send(
+                        data.get('method'), url, authorization,
+                        data.get('body'), limiter=limiter)
+        except Exception:
+            pass
+
+        return response
+
+    return decorated
+
+
+def legacy(func):
+    limiter = common.rate_limiter(func.group, func.rate) if func.rate else None
+    return legacy_coupang(func.__wrapped__, limiter)
+
+
+legacy_get_products_by_query = legacy(get_products_by_query)
+legacy_update_product_price_by_item = legacy(update_product_price_by_item)
+legacy_update_ordersheet_status = legacy(update_ordersheet_status)
+
+plain = common.CoupangClient('access', 'secret', 'A00000000', coalesce=False)
+plain_get_products_by_query = plain.bind(get_products_by_query)
+
+CASES = [
+    ('GET  + query', lambda: get_products_by_query({'vendorId': 'A00000000', 'nextToken': 1})),
+    ('PUT  + query', lambda: update_product_price_by_item({'vendorItemId': 1, 'price': 1000})),
+    ('PUT  + body ', lambda: update_ordersheet_status({'vendorId': 'A00000000', 'shipmentBoxIds': [1, 2, 3]})),
+]
+
+
+LEGACY = [
+    lambda: legacy_get_products_by_query({'vendorId': 'A00000000', 'nextToken': 1}),
+    lambda: legacy_update_product_price_by_item({'vendorItemId': 1, 'price': 1000}),
+    lambda: legacy_update_ordersheet_status({'vendorId': 'A00000000', 'shipmentBoxIds': [1, 2, 3]}),
+]
+
+
+SPEC_ONLY = [
+    lambda: get_products_by_query.__wrapped__({'vendorId': 'A00000000', 'nextToken': 1}),
+    lambda: update_product_price_by_item.__wrapped__({'vendorItemId': 1, 'price': 1000}),
+    lambda: update_ordersheet_status.__wrapped__({'vendorId': 'A00000000', 'shipmentBoxIds': [1, 2, 3]}),
+]
+
+
+def bench(cases, number, repeat=7):
+    '''cases 를 번갈아 가며 repeat 번 재서 각각의 최솟값(us)을 반환
+
+    번갈아 재기 때문에 측정 중 시스템 부하가 바뀌어도 비교 결과가 덜 흔들린다.
+    '''
+
+    best = [float('inf')] * len(cases)
+    for _ in range(repeat):
+        for i, case in enumerate(cases):
+            best[i] = min(best[i], timeit.timeit(case, number=number))
+    return [t / number * 1e6 for t in best]
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("                 명세 생성   데코레이터 오버헤드(이전 -> 현재)")
+    for (name, case), legacy_case, spec_only in zip(CASES, LEGACY, SPEC_ONLY):
+        spec, before, after = bench([spec_only, legacy_case, case], number)
+        print(f"{name}: {spec:7.2f} us  {before - spec:7.2f} us -> {after - spec:7.2f} us")
+
+    spec, after = bench([SPEC_ONLY[0], lambda: plain_get_products_by_query(
+            {'vendorId': 'A00000000', 'nextToken': 1})], number)
+    print(f"GET  + query (coalesce=False): {after - spec:7.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+'''패키지 import 시간 측정
+
+python -X importtime 으로 각 모듈을 새 인터프리터에서 import 하고
+모듈 자체의 누적 import 시간(us)을 출력한다.
+coupang.ini 가 없는 빈 디렉터리에서 실행하므로 import 시 설정 파일을 읽지 않는지도 확인된다.
+
+    python benchmarks/import_time.py [반복횟수]
+'''
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+MODULES = [
+    'coupang',
+    'coupang.common',
+    'coupang.category',
+    'coupang.product',
+    'coupang.ordersheet',
+    'coupang.rocketgrowth',
+    'coupang.coupons',
+    'coupang.search',
+    'coupang.transport',
+]
+
+
+def import_time(module, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=cwd, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    pattern = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)')
+    for line in proc.stderr.splitlines():
+        m = pattern.match(line)
+        if m and m.group(3) == module:
+            return int(m.group(1))
+    return 0
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cwd = tempfile.mkdtemp()
+    for module in MODULES:
+        best = min(import_time(module, cwd) for _ in range(repeat))
+        print(f"{module:24s} {best / 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
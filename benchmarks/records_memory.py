@@ -0,0 +1,126 @@
+'''발주서 dict 와 __slots__ 레코드(coupang.records)의 메모리 사용량 비교
+
+API 응답과 같은 형식의 발주서를 50개씩 페이지 단위로 json.loads 하고,
+dict 그대로 보관할 때와 OrderSheet 레코드로 바꿔 보관할 때
+남아 있는 메모리를 tracemalloc 으로 잰다.
+
+    python benchmarks/records_memory.py [발주서 수]
+'''
+
+import os
+import sys
+import json
+import gc
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from coupang.records import OrderSheet
+
+PAGE_SIZE = 50
+
+
+def ordersheet(n):
+    return {
+        'shipmentBoxId': 600000000 + n,
+        'orderId': 2000000000 + n,
+        'orderedAt': '2024-01-01T10:%02d:%02d' % (n // 60 % 60, n % 60),
+        'paidAt': '2024-01-01T10:%02d:%02d' % (n // 60 % 60, n % 60),
+        'status': 'ACCEPT',
+        'shippingPrice': 3000,
+        'remotePrice': 0,
+        'remoteArea': False,
+        'parcelPrintMessage': '',
+        'splitShipping': False,
+        'ableSplitShipping': False,
+        # 주문자/수취인 정보는 주문마다 다르고, 상품 정보는 상품(1000개)마다 반복된다
+        'orderer': {'name': '주문자%d' % n, 'email': 'a%d**@example.com' % n,
+                    'safeNumber': '0502-%08d' % n, 'ordererNumber': None},
+        'receiver': {'name': '수취인%d' % n, 'safeNumber': '0502-%08d' % n,
+                     'receiverNumber': None,
+                     'addr1': '서울특별시 송파구 송파대로 %d' % (n % 1000),
+                     'addr2': '%d동 %d호' % (n % 100, n % 1000),
+                     'postCode': '%05d' % (n % 100000)},
+        'orderItems': [{
+            'vendorItemPackageId': 0,
+            'vendorItemPackageName': '상품명 %d' % (n % 1000),
+            'productId': 7000000000 + n % 1000,
+            'vendorItemId': 3000000000 + n % 1000,
+            'vendorItemName': '상품명 %d, 옵션' % (n % 1000),
+            'shippingCount': 1,
+            'salesPrice': 15000,
+            'orderPrice': 15000,
+            'discountPrice': 0,
+            'instantCouponDiscount': 0,
+            'downloadableCouponDiscount': 0,
+            'coupangDiscount': 0,
+            'externalVendorSkuCode': 'SKU-%d' % (n % 1000),
+            'etcInfoHeader': None,
+            'etcInfoValue': None,
+            'etcInfoValues': None,
+            'sellerProductId': 1000000000 + n % 1000,
+            'sellerProductName': '상품명 %d' % (n % 1000),
+            'sellerProductItemName': '옵션',
+            'firstSellerProductItemName': '옵션',
+            'cancelCount': 0,
+            'holdCountForCancel': 0,
+            'estimatedShippingDate': '2024-01-02',
+            'plannedShippingDate': '',
+            'invoiceNumberUploadDate': None,
+            'extraProperties': {},
+            'pricingBadge': False,
+            'usedProduct': False,
+            'confirmDate': None,
+            'deliveryChargeTypeName': '무료',
+            'canceled': False,
+        }],
+        'overseaShippingInfoDto': {'personalCustomsClearanceCode': None,
+                                   'ordererSsn': None,
+                                   'ordererPhoneNumber': None},
+        'deliveryCompanyName': 'CJ 대한통운',
+        'invoiceNumber': '',
+        'inTrasitDateTime': '',
+        'deliveredDate': '',
+        'refer': '안드로이드앱',
+        'shipmentType': 'THIRD_PARTY',
+    }
+
+
+def pages(count):
+    '''API 응답 본문(JSON bytes) 목록을 만든다'''
+
+    bodies = []
+    for start in range(0, count, PAGE_SIZE):
+        data = [ordersheet(n) for n in range(start, min(count, start + PAGE_SIZE))]
+        bodies.append(json.dumps({'code': 200, 'data': data},
+                                 ensure_ascii=False).encode())
+    return bodies
+
+
+def measure(bodies, convert):
+    '''응답을 모두 해석해 보관했을 때 남아 있는 메모리(bytes)'''
+
+    gc.collect()
+    tracemalloc.start()
+    kept = []
+    for body in bodies:
+        kept.extend(convert(json.loads(body)['data']))
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    bodies = pages(count)
+    as_dicts = measure(bodies, lambda items: items)
+    as_records = measure(bodies, lambda items: map(OrderSheet, items))
+    print(f"발주서 {count}개")
+    print(f"  dict          {as_dicts / 2**20:8.1f} MB")
+    print(f"  OrderSheet    {as_records / 2**20:8.1f} MB"
+          f"  ({1 - as_records / as_dicts:.0%} 감소)")
+
+
+if __name__ == '__main__':
+    main()
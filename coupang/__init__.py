@@ -0,0 +1,40 @@
+'''쿠팡 오픈 API 파이썬 래퍼
+
+import 시에는 아무 파일도 읽지 않으며, 하위 모듈은 처음 사용할 때 불러온다.
+
+    import coupang
+    coupang.product.get_products_by_query({...})
+    client = coupang.CoupangClient('ACCESSKEY', 'SECRETKEY', 'A00012345')
+'''
+
+import importlib
+
+
+SUBMODULES = (
+        'common', 'transport',
+        'category', 'shipping', 'product', 'ordersheet', 'returns',
+        'exchange', 'cs', 'settlement', 'rocketgrowth', 'coupons', 'search',
+        'pagination', 'ordersync', 'catalog', 'itemcache', 'bulk',
+        'snapshot', 'invoices', 'watcher', 'records')
+
+# 패키지에서 바로 사용할 수 있는 이름 -> 정의된 모듈
+LAZY_ATTRS = {
+        'CoupangClient': 'common',
+        'Request': 'common',
+        'RetryPolicy': 'common',
+        'RetryBudget': 'common',
+        'RateLimiter': 'common',
+}
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module('coupang.' + name)
+    if name in LAZY_ATTRS:
+        module = importlib.import_module('coupang.' + LAZY_ATTRS[name])
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES) | set(LAZY_ATTRS))
@@ -0,0 +1,306 @@
+import queue
+import threading
+import contextlib
+from coupang import common
+from coupang.common import default_client
+
+
+##############################################################################
+# 아이템 일괄 변경                                                           #
+##############################################################################
+
+
+# 아이템 변경 API 들이 함께 사용하는 호출 속도 제한 group
+ITEM_GROUP = 'vendor-items'
+
+STOP = object()
+
+
+class Result:
+    '''변경 작업 하나의 결과
+
+    sent: API 를 호출했는지(ItemStateCache 로 건너뛰었으면 False)
+    error: 실패한 경우 발생한 예외(성공이면 None)
+    '''
+
+    __slots__ = ('vendor_item_id', 'op', 'value', 'sent', 'error')
+
+    def __init__(self, vendor_item_id, op, value, sent=False, error=None):
+        self.vendor_item_id = vendor_item_id
+        self.op = op
+        self.value = value
+        self.sent = sent
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        state = 'ok' if self.ok else f'error={self.error!r}'
+        return f"Result({self.vendor_item_id!r}, {self.op!r}, " + \
+                f"{self.value!r}, {state})"
+
+
+class BulkUpdate:
+    '''가격/재고/판매상태 일괄 변경
+
+    (vendorItemId, op, value) 목록을 workers 개 스레드로 동시에 처리한다.
+    op: 'price', 'quantity', 'stop', 'resume'(stop/resume 의 value 는 무시)
+
+    같은 옵션ID 의 작업은(3000 과 '3000' 도 같은 옵션으로 본다)
+    항상 같은 스레드에서 넣은 순서대로 처리되고,
+    다른 옵션ID 의 작업은 동시에 처리된다.
+    스레드별 대기열과 결과 대기열은 queue_size 개로 제한되므로
+    목록 전체나 처리 결과를 메모리에 쌓아 두지 않는다.
+
+    rate: 아이템 변경 API 전체의 초당 호출 수 제한(선택, run() 이 진행되는 동안만 적용)
+    cache: ItemStateCache 를 넘기면 값이 같은 작업은 호출하지 않는다
+
+    [예시]
+    bulk = BulkUpdate(workers=16, rate=50)
+    for result in bulk.run(changes):
+        if not result.ok:
+            print(result)
+    print(bulk.summary())
+    '''
+
+    def __init__(self, workers=8, rate=None, cache=None, client=None,
+                 queue_size=1000):
+        if client is None:
+            client = cache.client if cache is not None else default_client()
+        self.client = client
+        self.cache = cache
+        self.workers = workers
+        self.queue_size = queue_size
+        self.rate = rate
+
+        self.total = 0
+        self.sent = 0
+        self.failures = []
+
+    def apply(self, vendor_item_id, op, value):
+        '''작업 하나를 처리하고 결과를 반환(예외를 올리지 않음)'''
+
+        from coupang.itemcache import operation, FIXED_VALUES
+
+        result = Result(vendor_item_id, op, value)
+        try:
+            if self.cache is not None:
+                result.sent = self.cache.apply(vendor_item_id, op, value)
+            else:
+                func, field, arg = operation(op)
+                path = {'vendorItemId': int(vendor_item_id)}
+                if arg is not None:
+                    path[arg] = FIXED_VALUES.get(op, value)
+                self.client.call(func, path)
+                result.sent = True
+        except Exception as e:
+            result.error = e
+        return result
+
+    def run(self, changes):
+        '''작업을 처리하며 결과(Result)를 끝난 순서대로 반환하는 제너레이터'''
+
+        queues = [queue.Queue(self.queue_size) for _ in range(self.workers)]
+        results = queue.Queue(self.queue_size)
+        closed = threading.Event()
+
+        def put(item):
+            # 결과를 받는 쪽이 멈추면(제너레이터를 닫으면) 버린다
+            while not closed.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def feed():
+            try:
+                for vendor_item_id, op, value in changes:
+                    if closed.is_set():
+                        break
+                    # 3000 과 '3000' 은 같은 스레드로 보낸다
+                    try:
+                        index = int(vendor_item_id) % self.workers
+                    except (TypeError, ValueError):
+                        # 잘못된 옵션ID 는 apply() 에서 실패 결과가 된다
+                        index = 0
+                    queues[index].put((vendor_item_id, op, value))
+            except Exception as e:
+                put(e)
+            finally:
+                for q in queues:
+                    q.put(STOP)
+
+        def work(q):
+            while True:
+                change = q.get()
+                if change is STOP:
+                    put(STOP)
+                    return
+                if not closed.is_set():
+                    put(self.apply(*change))
+
+        if self.rate is not None:
+            scope = self.client.rate_limit(ITEM_GROUP, self.rate)
+        else:
+            scope = contextlib.nullcontext()
+
+        with scope:
+            threads = [threading.Thread(target=feed, daemon=True)]
+            threads += [threading.Thread(target=work, args=(q,), daemon=True)
+                        for q in queues]
+            for thread in threads:
+                thread.start()
+
+            try:
+                running = self.workers
+                while running:
+                    result = results.get()
+                    if result is STOP:
+                        running -= 1
+                        continue
+                    if isinstance(result, Exception):
+                        # changes 를 읽다가 난 오류
+                        raise result
+                    self.total += 1
+                    if result.sent:
+                        self.sent += 1
+                    if not result.ok:
+                        self.failures.append(result)
+                    yield result
+            finally:
+                closed.set()
+
+    def summary(self):
+        '''처리 결과 요약
+
+        {'total': 처리한 작업 수, 'sent': API 호출 수,
+         'skipped': 값이 같아 건너뛴 수, 'failed': 실패 수,
+         'failures': 실패한 Result 목록}
+        '''
+
+        failed = len(self.failures)
+        return {'total': self.total, 'sent': self.sent,
+                'skipped': self.total - self.sent - failed,
+                'failed': failed, 'failures': list(self.failures)}
+
+
+def bulk_update(changes, workers=8, rate=None, cache=None, client=None):
+    '''(vendorItemId, op, value) 목록을 일괄 처리하고 요약을 반환
+
+    [예시]
+    summary = bulk_update([
+        (3000000000, 'price', 15000),
+        (3000000000, 'quantity', 20),
+        (3000000001, 'stop', None),
+    ], workers=16)
+    for failure in summary['failures']:
+        print(failure.vendor_item_id, failure.error)
+    '''
+
+    bulk = BulkUpdate(workers, rate, cache, client)
+    for _ in bulk.run(changes):
+        pass
+    return bulk.summary()
+
+
+##############################################################################
+# 발주서 일괄 확인(상품준비중 처리)                                          #
+##############################################################################
+
+
+# update_ordersheet_status 한 번에 보낼 수 있는 최대 묶음배송번호 수
+ACKNOWLEDGE_BATCH = 50
+
+
+def chunks(values, size):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def acknowledge_orders(shipment_box_ids, vendor_id=None, workers=4,
+                       retries=2, rate=None, client=None):
+    '''발주서를 '결제완료'에서 '상품준비중'으로 일괄 변경
+
+    묶음배송번호를 50개씩 나누어 workers 개 묶음을 동시에 보내고(호출 속도 제한 적용),
+    응답의 responseList 로 번호별 성공/실패를 구한다.
+    실패한 번호 중 다시 시도할 수 있는 것(retryRequired, 또는 묶음 전체가
+    재시도할 수 있는 오류(429, 5xx, 연결 오류))만 새 묶음으로 만들어
+    최대 retries 번 다시 보내며, 성공한 번호는 다시 보내지 않는다.
+
+    rate: update_ordersheet_status 의 초당 호출 수 제한(선택, 이 호출이 진행되는 동안만 적용)
+
+    [반환값]
+    {'succeeded': [성공한 묶음배송번호, ...],
+     'failed': {실패한 묶음배송번호: 오류 메시지, ...}}
+
+    [예시]
+    report = acknowledge_orders(shipment_box_ids, workers=8)
+    for box, message in report['failed'].items():
+        print(box, message)
+    '''
+
+    from coupang.ordersheet import update_ordersheet_status
+    from coupang.pagination import iter_windows
+
+    if client is None:
+        client = default_client()
+    if vendor_id is None:
+        vendor_id = client.vendor_id
+    policy = common.RETRY_POLICY if client.retry_policy is None \
+            else client.retry_policy
+
+    def send(batch):
+        '''[(번호, 성공 여부, 재시도 가능 여부, 메시지), ...]'''
+
+        try:
+            response = client.call(update_ordersheet_status, {
+                    'vendorId': vendor_id, 'shipmentBoxIds': batch})
+        except Exception as e:
+            # 400 등은 다시 보내도 같은 결과이므로 재시도하지 않음
+            retryable = policy.is_retryable(e)
+            return [(box, False, retryable, str(e)) for box in batch]
+
+        data = response.get('data') or {}
+        # 넘긴 번호가 문자열이어도 찾을 수 있도록 문자열로 비교
+        results = {str(r.get('shipmentBoxId')): r
+                   for r in data.get('responseList') or ()}
+        rows = []
+        for box in batch:
+            r = results.get(str(box))
+            if r is None:
+                # 결과가 없는 번호는 응답 코드를 따른다(0: 모두 성공)
+                ok = data.get('responseCode') == 0
+                rows.append((box, ok, not ok, data.get('responseMessage')))
+            else:
+                rows.append((box, bool(r.get('succeed')),
+                             bool(r.get('retryRequired')),
+                             r.get('resultMessage')))
+        return rows
+
+    if rate is not None:
+        scope = client.rate_limit(update_ordersheet_status.group, rate)
+    else:
+        scope = contextlib.nullcontext()
+
+    succeeded = []
+    failed = {}
+    pending = list(dict.fromkeys(shipment_box_ids))
+    with scope:
+        for attempt in range(retries + 1):
+            retry = []
+            for box, ok, retryable, message in iter_windows(
+                    send, chunks(pending, ACKNOWLEDGE_BATCH), workers):
+                if ok:
+                    succeeded.append(box)
+                    failed.pop(box, None)
+                else:
+                    failed[box] = message
+                    if retryable:
+                        retry.append(box)
+            if not retry:
+                break
+            pending = retry
+    return {'succeeded': succeeded, 'failed': failed}
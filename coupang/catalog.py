@@ -0,0 +1,267 @@
+import json
+import sqlite3
+import datetime
+from coupang.common import default_client
+
+
+##############################################################################
+# 로컬 상품 카탈로그                                                         #
+##############################################################################
+
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS products (
+    seller_product_id INTEGER PRIMARY KEY,
+    seller_product_name TEXT,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    seller_product_item_id INTEGER PRIMARY KEY,
+    seller_product_id INTEGER NOT NULL,
+    vendor_item_id INTEGER,
+    item_name TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_product ON items (seller_product_id);
+CREATE INDEX IF NOT EXISTS items_vendor_item ON items (vendor_item_id);
+CREATE TABLE IF NOT EXISTS skus (
+    external_vendor_sku TEXT NOT NULL,
+    seller_product_id INTEGER NOT NULL,
+    vendor_item_id INTEGER,
+    seller_product_item_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS skus_sku ON skus (external_vendor_sku);
+CREATE INDEX IF NOT EXISTS skus_product ON skus (seller_product_id);
+'''
+
+
+class Catalog:
+    '''상품 정보를 SQLite 파일에 보관하는 로컬 카탈로그
+
+    pull() 로 전체 상품을 받아 두고 refresh() 로 새로 등록된 상품을 추가하면,
+    옵션ID(vendorItemId) -> 등록상품ID(sellerProductId),
+    판매자 상품코드(externalVendorSku) -> 옵션 조회를 네트워크 호출 없이
+    인덱스로 처리할 수 있다.
+
+    [주의]
+    get_products_by_time_frame 은 생성일시 기준이므로 refresh() 는 새 상품만 반영한다.
+    기존 상품을 수정했다면 refresh_product() 를 호출하거나 주기적으로 pull() 할 것.
+
+    [예시]
+    catalog = Catalog('catalog.db')
+    catalog.pull()
+    catalog.product_id_for_item(3000000000)
+    catalog.item_for_sku('SKU-001')
+    '''
+
+    def __init__(self, path='catalog.db', vendor_id=None, client=None,
+                 workers=8):
+        self.client = default_client() if client is None else client
+        self.vendor_id = self.client.vendor_id if vendor_id is None \
+                else vendor_id
+        self.workers = workers
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+
+    ##########################################################################
+    # 동기화
+
+    def pull(self, now=None):
+        '''전체 상품을 받아 카탈로그를 새로 채우고, 받은 상품 수를 반환
+
+        상품 목록(get_products_by_query)을 여러 페이지 동시에 받고,
+        상품마다 상세 정보(get_product_by_product_id)를 workers 개씩 동시에 받는다.
+        '''
+
+        from coupang.product import get_products_by_query
+        from coupang.pagination import iter_items_parallel
+
+        if now is None:
+            from coupang.pagination import now_kst
+            now = now_kst()
+        summaries = iter_items_parallel(
+                get_products_by_query,
+                {'vendorId': self.vendor_id, 'maxPerPage': 100},
+                page_key='nextToken', workers=self.workers,
+                client=self.client)
+        ids = (summary['sellerProductId'] for summary in summaries)
+
+        try:
+            self.db.execute('DELETE FROM products')
+            self.db.execute('DELETE FROM items')
+            self.db.execute('DELETE FROM skus')
+            count = self.store_all(ids)
+            self.set_synced_at(now)
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+        return count
+
+    def refresh(self, now=None, overlap=datetime.timedelta(minutes=10)):
+        '''마지막 동기화 이후 새로 등록된 상품을 추가하고, 추가한 상품 수를 반환
+
+        마지막 동기화 시각이 없으면 pull() 을 호출한다.
+        '''
+
+        from coupang.product import scan_products_by_time_frame
+
+        synced_at = self.synced_at()
+        if synced_at is None:
+            return self.pull(now)
+        if now is None:
+            from coupang.pagination import now_kst
+            now = now_kst()
+
+        products = scan_products_by_time_frame(
+                synced_at - overlap, now, vendor_id=self.vendor_id,
+                workers=self.workers, client=self.client)
+        ids = (product['sellerProductId'] for product in products)
+        try:
+            count = self.store_all(ids)
+            self.set_synced_at(now)
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+        return count
+
+    def refresh_product(self, seller_product_id):
+        '''상품 하나를 다시 받아 저장'''
+
+        self.store(self.fetch(seller_product_id))
+        self.db.commit()
+
+    def fetch(self, seller_product_id):
+        from coupang.product import get_product_by_product_id
+
+        return self.client.call(get_product_by_product_id,
+                                {'sellerProductId': seller_product_id})['data']
+
+    def store_all(self, ids):
+        from coupang.pagination import iter_windows
+
+        count = 0
+        for product in iter_windows(
+                lambda seller_product_id: [self.fetch(seller_product_id)],
+                ids, self.workers):
+            self.store(product)
+            count += 1
+        return count
+
+    def store(self, product):
+        '''상품 상세 정보(get_product_by_product_id 의 data)를 저장'''
+
+        seller_product_id = product['sellerProductId']
+        self.db.execute(
+                'INSERT OR REPLACE INTO products'
+                ' (seller_product_id, seller_product_name, status, data)'
+                ' VALUES (?, ?, ?, ?)',
+                (seller_product_id, product.get('sellerProductName'),
+                 product.get('statusName'),
+                 json.dumps(product, ensure_ascii=False)))
+        self.db.execute('DELETE FROM items WHERE seller_product_id = ?',
+                        (seller_product_id,))
+        self.db.execute('DELETE FROM skus WHERE seller_product_id = ?',
+                        (seller_product_id,))
+        for item in product.get('items') or ():
+            item_id = item.get('sellerProductItemId')
+            vendor_item_id = item.get('vendorItemId')
+            self.db.execute(
+                    'INSERT OR REPLACE INTO items'
+                    ' (seller_product_item_id, seller_product_id,'
+                    ' vendor_item_id, item_name, data) VALUES (?, ?, ?, ?, ?)',
+                    (item_id, seller_product_id, vendor_item_id,
+                     item.get('itemName'),
+                     json.dumps(item, ensure_ascii=False)))
+            sku = item.get('externalVendorSku')
+            if sku:
+                self.db.execute(
+                        'INSERT INTO skus (external_vendor_sku,'
+                        ' seller_product_id, vendor_item_id,'
+                        ' seller_product_item_id) VALUES (?, ?, ?, ?)',
+                        (sku, seller_product_id, vendor_item_id, item_id))
+
+    def synced_at(self):
+        row = self.db.execute(
+                "SELECT value FROM meta WHERE key = 'synced_at'").fetchone()
+        return None if row is None else \
+                datetime.datetime.strptime(row[0], TIME_FORMAT)
+
+    def set_synced_at(self, now):
+        self.db.execute(
+                "INSERT OR REPLACE INTO meta (key, value)"
+                " VALUES ('synced_at', ?)", (now.strftime(TIME_FORMAT),))
+
+    ##########################################################################
+    # 조회(네트워크 호출 없음)
+
+    def product(self, seller_product_id):
+        '''상품 상세 정보(없으면 None)'''
+
+        row = self.db.execute(
+                'SELECT data FROM products WHERE seller_product_id = ?',
+                (seller_product_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def items(self, seller_product_id):
+        '''상품의 옵션 목록'''
+
+        rows = self.db.execute(
+                'SELECT data FROM items WHERE seller_product_id = ?'
+                ' ORDER BY seller_product_item_id', (seller_product_id,))
+        return [json.loads(row[0]) for row in rows]
+
+    def item(self, vendor_item_id):
+        '''옵션ID 로 옵션 정보 조회(없으면 None)'''
+
+        row = self.db.execute(
+                'SELECT data FROM items WHERE vendor_item_id = ?',
+                (vendor_item_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def product_id_for_item(self, vendor_item_id):
+        '''옵션ID 가 속한 등록상품ID(없으면 None)'''
+
+        row = self.db.execute(
+                'SELECT seller_product_id FROM items WHERE vendor_item_id = ?',
+                (vendor_item_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def item_for_sku(self, external_vendor_sku):
+        '''판매자 상품코드로 옵션 정보 조회(없으면 None)'''
+
+        row = self.db.execute(
+                'SELECT items.data FROM skus JOIN items'
+                ' ON items.seller_product_item_id = skus.seller_product_item_id'
+                ' WHERE skus.external_vendor_sku = ?',
+                (external_vendor_sku,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def product_for_sku(self, external_vendor_sku):
+        '''판매자 상품코드로 상품 상세 정보 조회(없으면 None)'''
+
+        row = self.db.execute(
+                'SELECT seller_product_id FROM skus'
+                ' WHERE external_vendor_sku = ?',
+                (external_vendor_sku,)).fetchone()
+        return None if row is None else self.product(row[0])
@@ -27,7 +27,7 @@ def get_product_auto_category(body):
     }
 
 
-@coupang
+@coupang(cache_ttl=60 * 60 * 24)
 def get_category_meta(path):
     '''카테고리의 고시정보,옵션,구비서류,인증정보 목록을 조회
 
@@ -43,7 +43,7 @@ def get_category_meta(path):
     }
 
 
-@coupang
+@coupang(cache_ttl=60 * 60 * 24)
 def get_categories():
     '''카테고리 목록조회
 
@@ -57,7 +57,7 @@ def get_categories():
     }
 
 
-@coupang
+@coupang(cache_ttl=60 * 60 * 24)
 def get_category(path):
     '''카테고리 조회'''
 
@@ -69,7 +69,7 @@ def get_category(path):
     }
 
 
-@coupang
+@coupang(cache_ttl=60 * 60 * 24)
 def get_category_validation(path):
     '''카테고리 유효성 검사
 
@@ -1,31 +1,75 @@
-import os
+import copy
 import time
-import re
-import configparser
+import threading
+import importlib
+import random
+import collections
 import hmac, hashlib
 import urllib.parse
-import urllib.request
-import ssl
-import json
-from functools import wraps
+from functools import wraps, partial
 
 
-config = configparser.ConfigParser()
-config.read('coupang.ini')
-SECRETKEY = config['DEFAULT'].get('SECRETKEY')
-ACCESSKEY = config['DEFAULT'].get('ACCESSKEY')
-VENDOR_ID = config['DEFAULT'].get('VENDOR_ID')
+SECRETKEY = None
+ACCESSKEY = None
+VENDOR_ID = None
+CONFIG_FILE = 'coupang.ini'
 
-if SECRETKEY is None:
-    raise Exception('SECRETKEY를 설정해주십시오.')
-if ACCESSKEY is None:
-    raise Exception('ACCESSKEY를 설정해주십시오.')
-if VENDOR_ID is None:
-    raise Exception('VENDOR_ID를 설정해주십시오.')
 
-SECRETKEY = re.sub('^\'|^\"|\'$|\"$', '', SECRETKEY)
-ACCESSKEY = re.sub('^\'|^\"|\'$|\"$', '', ACCESSKEY)
-VENDOR_ID = re.sub('^\'|^\"|\'$|\"$', '', VENDOR_ID)
+def load_config(path=None):
+    '''설정 파일(coupang.ini)에서 계정 정보를 읽는다
+
+    import 시점이 아니라 기본 클라이언트를 처음 사용할 때 한 번 호출된다.
+    '''
+
+    import configparser
+    import re
+
+    global SECRETKEY, ACCESSKEY, VENDOR_ID
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE if path is None else path)
+    secretkey = config['DEFAULT'].get('SECRETKEY')
+    accesskey = config['DEFAULT'].get('ACCESSKEY')
+    vendor_id = config['DEFAULT'].get('VENDOR_ID')
+
+    if secretkey is None:
+        raise Exception('SECRETKEY를 설정해주십시오.')
+    if accesskey is None:
+        raise Exception('ACCESSKEY를 설정해주십시오.')
+    if vendor_id is None:
+        raise Exception('VENDOR_ID를 설정해주십시오.')
+
+    SECRETKEY = re.sub('^\'|^\"|\'$|\"$', '', secretkey)
+    ACCESSKEY = re.sub('^\'|^\"|\'$|\"$', '', accesskey)
+    VENDOR_ID = re.sub('^\'|^\"|\'$|\"$', '', vendor_id)
+    return SECRETKEY, ACCESSKEY, VENDOR_ID
+
+
+# coupang.transport 로 옮겨진 이름들(기존 import 경로 호환)
+TRANSPORT_NAMES = (
+        'request', 'request_async', 'ssl_context',
+        'ConnectionPool', 'AsyncConnectionPool',
+        'get_pool', 'get_async_pool', 'configure_pool', 'close_async_pools')
+
+_transport = None
+
+
+def transport():
+    '''전송 계층 모듈(coupang.transport)
+
+    ssl, http.client, asyncio 등 무거운 모듈은 첫 요청 때 불러온다.
+    '''
+
+    global _transport
+    if _transport is None:
+        _transport = importlib.import_module('coupang.transport')
+    return _transport
+
+
+def __getattr__(name):
+    if name in TRANSPORT_NAMES:
+        return getattr(transport(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 ##############################################################################
@@ -34,249 +78,1078 @@ VENDOR_ID = re.sub('^\'|^\"|\'$|\"$', '', VENDOR_ID)
 
 
 # decorator
-def coupang(f):
+def coupang(f=None, *, rate=None, group=None, cache_ttl=None, invalidates=()):
+    '''API 명세를 반환하는 함수를 실제 API 호출 함수로 만드는 데코레이터
+
+    rate: 초당 최대 호출 수(선택)
+    group: 호출 수를 함께 세는 엔드포인트 묶음 이름(기본값: 함수 이름)
+    cache_ttl: 응답 캐시 유지 시간(초, 선택)
+        클라이언트에 캐시가 켜져 있을 때(enable_cache) GET 응답에만 적용
+        응답을 받아 유지 시간을 반환하는 함수도 가능(0 또는 None 이면 저장 안 함)
+    invalidates: 호출에 성공하면 캐시를 비울 조회 API 이름들(선택)
+
+    [예시]
+    @coupang(rate=10, group='seller-products.create')
+    def create_product(body): ...
+
+    만들어진 함수는 기본 클라이언트(coupang.ini 의 계정)로 호출되며,
+    아래 속성이 추가된다.
+    .spec(...): 호출하지 않고 요청 명세(Request)만 반환
+    .aio(...): 같은 API를 호출하는 코루틴 함수
+    '''
+
+    if f is None:
+        return lambda f: coupang(
+                f, rate=rate, group=group,
+                cache_ttl=cache_ttl, invalidates=invalidates)
+
+    @wraps(f)
+    def spec(*args, **kwargs):
+        return Request.from_spec(f(*args, **kwargs))
+
     @wraps(f)
     def decorated(*args, **kwargs):
-        secretkey = SECRETKEY
-        accesskey = ACCESSKEY
-        vendorId = VENDOR_ID
-        retry = True
-
-        data = f(*args, **kwargs)
-        response = None
-        if data.get('method') == 'PUT':
-            if 'query' in data:
-                authorization = auth(
-                        secretkey,
-                        accesskey,
-                        data.get('method'),
-                        data.get('path'),
-                        data.get('query')
-                )
-                url = "https://api-gateway.coupang.com"+\
-                        data.get('path')+\
-                        "?%s" % data.get('query')
-                try:
-                    response = request(data.get('method'), url, authorization)
-                except:
-                    if retry:
-                        retry = False
-                        time.sleep(1)
-                        try:
-                            response = request(data.get('method'), url, authorization)
-                        except:
-                            pass
-                    else:
-                        pass
-
-            elif 'body' in data:
-                authorization = auth(
-                        secretkey,
-                        accesskey,
-                        data.get('method'),
-                        data.get('path')
-                )
-                url = "https://api-gateway.coupang.com"+data.get('path')
-                try:
-                    response = request(
-                            data.get('method'),
-                            url,
-                            authorization,
-                            data.get('body')
-                    )
-                except:
-                    if retry:
-                        retry = False
-                        time.sleep(1)
-                        try:
-                            response = request(
-                                    data.get('method'),
-                                    url,
-                                    authorization,
-                                    data.get('body')
-                            )
-                        except:
-                            pass
-                    else:
-                        pass
+        client = default_client()
+        try:
+            return client.call(decorated, *args, **kwargs)
+        except Exception:
+            # 재시도할 수 없는 오류이거나 재시도 횟수를 모두 사용한 경우
+            # (오류 내용은 request()에서 출력)
+            return None
+
+    @wraps(f)
+    async def decorated_aio(*args, **kwargs):
+        client = default_client()
+        try:
+            return await client.acall(decorated, *args, **kwargs)
+        except Exception:
+            return None
+
+    decorated.spec = decorated_aio.spec = spec
+    decorated.rate = decorated_aio.rate = rate
+    decorated.group = decorated_aio.group = group or f.__name__
+    decorated.cache_ttl = decorated_aio.cache_ttl = cache_ttl
+    decorated.invalidates = decorated_aio.invalidates = tuple(invalidates)
+    decorated.aio = decorated_aio
+    return decorated
+
+
+def aio(f=None, *, rate=None, group=None, cache_ttl=None, invalidates=()):
+    '''coupang 데코레이터의 asyncio 버전
+
+    API 명세(method, path, query, body)를 반환하는 함수는 그대로 두고
+    asyncio 스트림 기반 커넥션 풀로 전송하는 코루틴 함수를 만든다.
+    @coupang 이 붙은 함수는 모두 .aio 속성으로 이 코루틴을 가지고 있다.
+
+    [예시]
+    result = await get_product_by_product_id.aio({'sellerProductId': '1'})
+    '''
+
+    if f is None:
+        return lambda f: aio(
+                f, rate=rate, group=group,
+                cache_ttl=cache_ttl, invalidates=invalidates)
+
+    return coupang(
+            f, rate=rate, group=group,
+            cache_ttl=cache_ttl, invalidates=invalidates).aio
+
+
+coupang.aio = aio
+
+
+BASE_URL = "https://api-gateway.coupang.com"
+
+
+class Request:
+    '''API 요청 명세
+
+    method: 'GET', 'POST', 'PUT', 'DELETE'
+    path: /v2/providers/... 형태의 경로
+    query: urlencode 된 쿼리 문자열(선택)
+    body: 요청 본문 bytes(선택)
+    '''
+
+    __slots__ = ('method', 'path', 'query', 'body')
+
+    def __init__(self, method, path, query=None, body=None):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.body = body
+
+    @classmethod
+    def from_spec(cls, data):
+        '''API 함수가 반환한 dict 를 Request 로 변환
+
+        PUT 은 query 가 있으면 body 를 보내지 않고,
+        POST, DELETE 는 query 를 보내지 않으며,
+        GET, DELETE 는 body 를 보내지 않는다.
+        '''
+
+        method = data.get('method')
+        query = data.get('query')
+        body = data.get('body')
+        if method == 'GET':
+            body = None
+        elif method == 'PUT':
+            if query is not None:
+                body = None
+        else:
+            query = None
+            if method == 'DELETE':
+                body = None
+        return cls(method, data.get('path'), query, body)
+
+    def url(self, base_url=None):
+        if base_url is None:
+            base_url = BASE_URL
+        if self.query is None:
+            return base_url + self.path
+        return base_url + self.path + "?" + self.query
+
+    def key(self):
+        '''캐시 등에 사용하는 요청 식별자(서명 대상인 method, path, query)'''
+
+        return (self.method, self.path, self.query)
+
+    def __repr__(self):
+        return f"Request({self.method!r}, {self.path!r}, query={self.query!r})"
+
+
+##############################################################################
+# 응답 캐시                                                                  #
+##############################################################################
+
+
+MISSING = object()
+
+
+def response_ttl(func, response):
+    '''응답을 캐시에 보관할 시간(초), 보관하지 않으면 0 또는 None'''
+
+    ttl = func.cache_ttl
+    return ttl(response) if callable(ttl) else ttl
+
+
+class ResponseCache:
+    '''TTL + LRU 응답 캐시
+
+    최대 maxsize개의 응답을 보관하며, 넘치면 가장 오래 사용하지 않은 것부터 버린다.
+    항목마다 유지 시간(ttl)이 지나면 없는 것으로 취급한다(float('inf') 이면 계속 보관).
+    여러 스레드에서 함께 사용해도 안전하다.
+
+    store(DiskStore)를 넘기면 응답을 파일에도 저장해,
+    프로세스를 다시 시작해도 유지 시간이 남은 응답을 사용한다.
+
+    캐시된 응답은 호출한 쪽과 같은 객체를 공유하므로 수정하지 말 것.
+    '''
+
+    def __init__(self, maxsize=1024, store=None):
+        self.maxsize = maxsize
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()  # key -> (만료 시각, 태그, 값)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        '''캐시된 값을 반환(없거나 만료되었으면 MISSING)'''
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                del self._data[key]
+            if self.store is None:
+                self.misses += 1
+                return MISSING
 
+        found = self.store.get(key)
+        with self._lock:
+            if found is None:
+                self.misses += 1
+                return MISSING
+            self.hits += 1
+            ttl, tag, value = found
+            self._put(key, value, ttl, tag)
+            return value
+
+    def set(self, key, value, ttl, tag=None):
+        with self._lock:
+            self._put(key, value, ttl, tag)
+        if self.store is not None:
+            self.store.set(key, value, ttl, tag)
+
+    def _put(self, key, value, ttl, tag):
+        self._data[key] = (time.monotonic() + ttl, tag, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key=None, tag=None):
+        '''캐시 무효화
+
+        key: 해당 요청의 응답만 삭제
+        tag: 해당 태그(API 함수 이름)로 저장된 응답을 모두 삭제
+        둘 다 없으면 전체 삭제
+        '''
+
+        with self._lock:
+            if key is not None:
+                self._data.pop(key, None)
+            elif tag is not None:
+                for k in [k for k, v in self._data.items() if v[1] == tag]:
+                    del self._data[k]
             else:
-                authorization = auth(
-                        secretkey,
-                        accesskey,
-                        data.get('method'),
-                        data.get('path')
-                )
-                url = "https://api-gateway.coupang.com"+data.get('path')
-                try:
-                    response = request(data.get('method'), url, authorization)
-                except:
-                    if retry:
-                        retry = False
-                        time.sleep(1)
-                        try:
-                            response = request(data.get('method'), url, authorization)
-                        except:
-                            pass
-                    else:
-                        pass
-
-        elif data.get('method') == 'GET':
-            if 'query' in data:
-                authorization = auth(
-                        secretkey,
-                        accesskey,
-                        data.get('method'),
-                        data.get('path'),
-                        data.get('query')
-                )
-                url = "https://api-gateway.coupang.com"+\
-                        data.get('path')+\
-                        "?%s" % data.get('query')
+                self._data.clear()
+        if self.store is not None:
+            self.store.invalidate(key, tag)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._data), 'maxsize': self.maxsize}
+
+
+class DiskStore:
+    '''ResponseCache 의 응답을 SQLite 파일에 보관하는 저장소
+
+    만료 시각은 실제 시각(time.time) 기준으로 저장하며,
+    유지 시간이 무한(float('inf'))인 응답은 무효화하기 전까지 보관한다.
+
+    [예시]
+    client.enable_cache(path='cache.db')
+    '''
+
+    def __init__(self, path):
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY, tag TEXT, expires REAL, value TEXT)')
+        self.db.execute('DELETE FROM responses WHERE expires <= ?',
+                        (time.time(),))
+        self.db.commit()
+
+    @staticmethod
+    def encode(key):
+        import json
+        return json.dumps(key)
+
+    def get(self, key):
+        '''(남은 유지 시간, 태그, 값), 없거나 만료되었으면 None'''
+
+        import json
+
+        with self._lock:
+            row = self.db.execute(
+                    'SELECT tag, expires, value FROM responses WHERE key = ?',
+                    (self.encode(key),)).fetchone()
+        if row is None:
+            return None
+        tag, expires, value = row
+        ttl = float('inf') if expires is None else expires - time.time()
+        if ttl <= 0:
+            return None
+        return ttl, tag, json.loads(value)
+
+    def set(self, key, value, ttl, tag=None):
+        import json
+
+        expires = None if ttl == float('inf') else time.time() + ttl
+        with self._lock:
+            self.db.execute(
+                    'INSERT OR REPLACE INTO responses (key, tag, expires, value)'
+                    ' VALUES (?, ?, ?, ?)',
+                    (self.encode(key), tag, expires,
+                     json.dumps(value, ensure_ascii=False)))
+            self.db.commit()
+
+    def invalidate(self, key=None, tag=None):
+        with self._lock:
+            if key is not None:
+                self.db.execute('DELETE FROM responses WHERE key = ?',
+                                (self.encode(key),))
+            elif tag is not None:
+                self.db.execute('DELETE FROM responses WHERE tag = ?', (tag,))
             else:
-                authorization = auth(
-                        secretkey,
-                        accesskey,
-                        data.get('method'),
-                        data.get('path')
-                )
-                url = "https://api-gateway.coupang.com"+data.get('path')
-            try:
-                response = request(data.get('method'), url, authorization)
-            except:
-                if retry:
-                    retry = False
-                    time.sleep(1)
-                    try:
-                        response = request(data.get('method'), url, authorization)
-                    except:
-                        pass
-                else:
-                    pass
-
-        elif data.get('method') == 'DELETE':
-            authorization = auth(
-                    secretkey,
-                    accesskey,
-                    data.get('method'),
-                    data.get('path')
-            )
-            url = "https://api-gateway.coupang.com"+data.get('path')
-            try:
-                response = request(data.get('method'), url, authorization)
-            except:
-                if retry:
-                    retry = False
-                    time.sleep(1)
-                    try:
-                        response = request(data.get('method'), url, authorization)
-                    except:
-                        pass
-                else:
-                    pass
-
-        elif data.get('method') == 'POST':
-            authorization = auth(
-                    secretkey,
-                    accesskey,
-                    data.get('method'),
-                    data.get('path')
-            )
-            url = "https://api-gateway.coupang.com"+data.get('path')
-            try:
-                response = request(
-                        data.get('method'),
-                        url,
-                        authorization,
-                        data.get('body')
-                )
-            except:
-                if retry:
-                    retry = False
-                    time.sleep(1)
-                    try:
-                        response = request(
-                                data.get('method'),
-                                url,
-                                authorization,
-                                data.get('body')
-                        )
-                    except:
-                        pass
-                else:
-                    pass
+                self.db.execute('DELETE FROM responses')
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+##############################################################################
+# 동일 요청 묶기(singleflight)                                               #
+##############################################################################
+
+
+class Flight:
+    '''진행 중인 요청 하나(스레드용)'''
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = None  # 기다리는 호출이 생길 때 만든다
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    '''같은 요청이 동시에 여러 번 들어오면 하나만 보내고 결과를 나눠 갖는다
+
+    먼저 들어온 호출(leader)만 실제로 요청을 보내고,
+    그 사이에 들어온 같은 key 의 호출은 leader 의 결과(또는 예외)를 그대로 받는다.
+    lock 은 진행 중인 요청 목록을 고칠 때만 잡으며 네트워크 호출 중에는 잡지 않는다.
+    스레드(do)와 asyncio(do_async) 모두 지원한다.
+
+    leader 는 결과 객체를 그대로 받고, 함께 기다린 호출은 각자 깊은 복사본을 받으므로
+    받은 응답을 수정해도 다른 호출에 영향이 없다.
+    '''
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+            elif flight.event is None:
+                # 경합이 없는 호출은 Event 를 만들지 않도록 기다리는 쪽에서 만든다
+                flight.event = threading.Event()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                event = flight.event
+            if event is not None:
+                event.set()
+
+    async def do_async(self, key, fn):
+        '''do()의 asyncio 버전(fn 은 코루틴을 반환하는 함수)
+
+        같은 이벤트 루프 안의 호출끼리만 묶는다.
+        요청은 별도 태스크로 실행하고 모든 호출이 asyncio.shield 로 기다리므로,
+        한 호출이 취소되어도(asyncio.wait_for 시간 초과 등) 요청과 다른 호출에는 영향이 없다.
+        '''
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        with self._lock:
+            task = self._flights.get(key)
+            leader = task is None
+            if leader:
+                task = self._flights[key] = loop.create_task(
+                        self._run(key, fn))
+                task.add_done_callback(_retrieve)
+        result = await asyncio.shield(task)
+        return result if leader else copy.deepcopy(result)
+
+    async def _run(self, key, fn):
+        try:
+            return await fn()
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+
+def _retrieve(task):
+    # 기다리는 쪽이 모두 취소된 경우 "exception was never retrieved" 경고 방지
+    if not task.cancelled():
+        task.exception()
+
+
+##############################################################################
+# 재시도 정책                                                                #
+##############################################################################
+
+
+class RetryBudget:
+    '''프로세스 전체의 재시도 예산
+
+    요청 1건마다 ratio개의 토큰이 쌓이고(최대 capacity개),
+    재시도 1번에 토큰 1개를 사용한다.
+    장애 상황에서도 재시도로 늘어나는 트래픽이
+    정상 요청의 ratio배를 넘지 않는다.
+    '''
+
+    def __init__(self, ratio=0.2, capacity=100):
+        self.ratio = ratio
+        self.capacity = capacity
+        self._tokens = capacity
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class RetryPolicy:
+    '''재시도 정책
+
+    429, 5xx 응답과 연결 오류만 재시도하며,
+    재시도 간격은 base_delay * 2^n 초(최대 max_delay 초) 범위에서
+    무작위로 정한다(full jitter).
+    응답에 Retry-After 헤더가 있으면 그 시간만큼 기다린다.
+    '''
+
+    def __init__(self, max_retries=3, base_delay=0.5, max_delay=30,
+                 budget=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = RetryBudget() if budget is None else budget
+
+    @staticmethod
+    def is_retryable(e):
+        import urllib.error
+
+        if isinstance(e, urllib.error.HTTPError):
+            return e.code == 429 or 500 <= e.code < 600
+        return isinstance(e, urllib.error.URLError)
+
+    def should_retry(self, e, attempt):
+        return attempt < self.max_retries \
+                and self.is_retryable(e) \
+                and self.budget.withdraw()
+
+    def delay(self, e, attempt):
+        '''attempt번째 재시도 전에 기다릴 시간(초)'''
+
+        retry_after = retry_after_seconds(e)
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(
+                0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+RETRY_POLICY = RetryPolicy()
 
-        return response
-    return decorated
+
+def set_retry_policy(policy):
+    '''기본 재시도 정책 변경
+
+    [예시]
+    set_retry_policy(RetryPolicy(max_retries=5, max_delay=10))
+    set_retry_policy(RetryPolicy(max_retries=0))  # 재시도하지 않음
+    '''
+
+    global RETRY_POLICY
+    RETRY_POLICY = policy
+
+
+def retry_after_seconds(e):
+    '''HTTPError 의 Retry-After 헤더를 초 단위로 변환(없으면 None)'''
+
+    import email.utils
+
+    headers = getattr(e, 'headers', None)
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def execute(req, limiter=None):
+    '''기본 클라이언트로 요청 명세(Request)를 실행(CoupangClient.execute 참조)'''
+
+    return default_client().execute(req, limiter)
+
+
+async def execute_async(req, limiter=None):
+    '''execute()의 asyncio 버전'''
+
+    return await default_client().execute_async(req, limiter)
+
+
+##############################################################################
+# 호출 속도 제한                                                             #
+##############################################################################
+
+
+class RateLimiter:
+    '''토큰 버킷 방식의 호출 속도 제한
+
+    초당 rate개의 토큰이 채워지고, 최대 burst개까지 쌓인다.
+    호출할 때마다 토큰을 하나씩 예약하며, 토큰이 모자라면
+    채워질 때까지 기다린다(스레드는 sleep, 코루틴은 await).
+    예약은 lock 안에서 순서대로 이루어지므로
+    여러 스레드와 이벤트 루프에서 함께 사용해도 제한을 넘지 않는다.
+    '''
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        '''토큰 하나를 예약하고 기다려야 하는 시간(초)을 반환'''
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        import asyncio
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def rate_limiter(group, rate=None, burst=None):
+    '''기본 클라이언트의 엔드포인트 묶음(group)별 RateLimiter 를 반환
+
+    같은 group 을 사용하는 함수들은 하나의 제한을 공유한다.
+    아직 제한이 없는 group 은 rate 를 지정해야 한다(없으면 ValueError).
+    '''
+
+    return default_client().rate_limiter(group, rate, burst)
+
+
+def enable_cache(maxsize=1024, path=None):
+    '''기본 클라이언트의 응답 캐시 사용
+
+    카테고리, 출고지/반품지 목록처럼 자주 바뀌지 않는 조회 API
+    (cache_ttl 이 선언된 함수)의 응답을 유지 시간 동안 재사용한다.
+    path 를 지정하면 응답을 SQLite 파일에도 저장한다.
+
+    [예시]
+    cache = enable_cache(maxsize=2048)
+    cache.stats()  # {'hits': ..., 'misses': ..., 'size': ..., 'maxsize': ...}
+    '''
+
+    return default_client().enable_cache(maxsize, path)
+
+
+def invalidate(func=None, *args, **kwargs):
+    '''기본 클라이언트의 응답 캐시 무효화(CoupangClient.invalidate 참조)'''
+
+    default_client().invalidate(func, *args, **kwargs)
+
+
+def set_rate_limit(group, rate, burst=None):
+    '''기본 클라이언트의 엔드포인트 묶음(group)별 초당 호출 수 제한 변경
+
+    [예시]
+    set_rate_limit('seller-products.create', 5)
+    '''
+
+    default_client().set_rate_limit(group, rate, burst)
+
+
+_signed_date = (None, None)  # (초 단위 시각, 서명용 날짜 문자열)
 
 
 def date_time():
-    os.environ['TZ'] = 'GMT+0'
-    return time.strftime('%y%m%d')+'T'+time.strftime('%H%M%S')+'Z'
+    '''서명에 사용하는 UTC 날짜 문자열(yymmddTHHMMSSZ)
+
+    time.gmtime() 한 번으로 만들기 때문에 환경변수(TZ)를 건드리지 않고,
+    초가 바뀌는 순간에 날짜와 시각이 어긋날 일도 없다.
+    같은 초 안에서는 이전에 만든 문자열을 재사용한다.
+    '''
+
+    global _signed_date
+    now = int(time.time())
+    cached_at, value = _signed_date
+    if cached_at != now:
+        value = time.strftime('%y%m%dT%H%M%SZ', time.gmtime(now))
+        _signed_date = (now, value)
+    return value
+
+
+class Signer:
+    '''요청 서명기(HMAC-SHA256)
+
+    secretkey 로 만든 HMAC 상태를 미리 계산해 두고
+    서명할 때마다 복사해서 사용한다.
+    원본 상태는 변경하지 않으므로 여러 스레드와 이벤트 루프에서
+    하나의 Signer 를 함께 사용해도 안전하다.
+    '''
+
+    __slots__ = ('accesskey', '_hmac', '_prefix')
+
+    def __init__(self, secretkey, accesskey):
+        self.accesskey = accesskey
+        self._hmac = hmac.new(secretkey.encode('utf-8'), digestmod=hashlib.sha256)
+        self._prefix = "CEA algorithm=HmacSHA256, access-key="+accesskey+\
+                ", signed-date="
+
+    def sign(self, method, path, query=None):
+        '''Authorization 헤더 값을 반환'''
+
+        datetime = date_time()
+
+        if query:
+            message = datetime + method + path + query
+        else:
+            message = datetime + method + path
+
+        h = self._hmac.copy()
+        h.update(message.encode('utf-8'))
+
+        return self._prefix + datetime + ", signature=" + h.hexdigest()
+
+
+_signers = {}
+
+
+def signer(secretkey, accesskey):
+    '''키 쌍별 Signer 를 반환(없으면 생성)'''
+
+    key = (secretkey, accesskey)
+    s = _signers.get(key)
+    if s is None:
+        s = _signers[key] = Signer(secretkey, accesskey)
+    return s
 
 
 def auth(secretkey, accesskey, method, path, query=None):
-    datetime = date_time()
+    return signer(secretkey, accesskey).sign(method, path, query)
 
-    if query:
-        message = datetime + method + path + query
-    else:
-        message = datetime + method + path
 
-    signature=hmac.new(
-            secretkey.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256).hexdigest()
+##############################################################################
+# 클라이언트                                                                 #
+##############################################################################
 
-    authorization = "CEA algorithm=HmacSHA256, access-key="+accesskey+\
-            ", signed-date="+datetime+\
-            ", signature="+signature
 
-    return authorization
+ENDPOINT_MODULES = (
+        'category', 'shipping', 'product', 'ordersheet', 'returns',
+        'exchange', 'cs', 'settlement', 'rocketgrowth', 'coupons')
 
 
-def request(method, url, authorization, body=None):
-    req = urllib.request.Request(url)
-    req.add_header("Content-type","application/json;charset=UTF-8")
-    req.add_header("Authorization",authorization)
-    req.add_header("X-EXTENDED-TIMEOUT", "90000") # 타임아웃 시간늘리기
-    req.get_method = lambda: method
+class CoupangClient:
+    '''판매자 계정별 API 클라이언트
 
-    #skipping for ssl cert.
-    ctx = ssl.create_default_context()
-    ctx.check_hostname = False
-    ctx.verify_mode = ssl.CERT_NONE
+    계정마다 서명기(Signer), 호출 속도 제한, 재시도 정책을 따로 가진다.
+    커넥션 풀은 기본적으로 같은 호스트를 사용하는 클라이언트끼리 공유하며,
+    pool 을 넘기면 그 풀을 사용한다. 이때 asyncio 요청도 공유 풀 대신
+    pool 과 같은 설정으로 만든 이 클라이언트 전용 풀(이벤트 루프별)을 사용한다.
+    하나의 프로세스에서 여러 판매자 계정을 동시에 다룰 수 있다.
 
-    try:
-        if body:
-            resp = urllib.request.urlopen(req, body, context=ctx)
+    모든 API 모듈은 클라이언트의 속성으로 사용할 수 있다.
+
+    [예시]
+    client = CoupangClient('ACCESSKEY', 'SECRETKEY', 'A00012345')
+    client.product.get_products_by_query({'vendorId': client.vendor_id})
+    await client.ordersheet.get_ordersheet_by_shipmentboxid.aio({...})
+
+    coalesce 가 True(기본값)이면 동시에 들어온 같은 GET 요청은
+    한 번만 보내고 결과를 함께 사용한다(SingleFlight).
+
+    raise_errors 가 False(기본값)이면 모듈 함수와 마찬가지로
+    오류 발생 시 None 을 반환하고, True 이면 예외를 그대로 올린다.
+    call()/execute()는 항상 예외를 올린다.
+    '''
+
+    def __init__(self, access_key, secret_key, vendor_id, base_url=None,
+                 pool=None, retry_policy=None, rate_limits=None,
+                 raise_errors=False, cache=None, coalesce=True):
+        self.access_key = access_key
+        self.vendor_id = vendor_id
+        self.base_url = BASE_URL if base_url is None else base_url
+        parsed = urllib.parse.urlsplit(self.base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 443
+        self.pool = pool
+        self._async_pools = {}  # 이벤트 루프 -> 전용 asyncio 풀(pool 을 넘긴 경우)
+        self.signer = Signer(secret_key, access_key)
+        self.retry_policy = retry_policy
+        self.raise_errors = raise_errors
+        self.cache = cache
+        self.singleflight = SingleFlight() if coalesce else None
+        self.limiters = {}
+        self._limiters_lock = threading.Lock()
+        for group, rate in (rate_limits or {}).items():
+            self.set_rate_limit(group, rate)
+
+    def __repr__(self):
+        return f"CoupangClient(vendor_id={self.vendor_id!r})"
+
+    def __getattr__(self, name):
+        if name not in ENDPOINT_MODULES:
+            raise AttributeError(name)
+        module = importlib.import_module('coupang.' + name)
+        endpoints = Endpoints(self, module)
+        setattr(self, name, endpoints)
+        return endpoints
+
+    def rate_limiter(self, group, rate=None, burst=None):
+        '''엔드포인트 묶음(group)별 RateLimiter 를 반환(없으면 rate 로 생성)'''
+
+        with self._limiters_lock:
+            limiter = self.limiters.get(group)
+            if limiter is None:
+                if rate is None:
+                    raise ValueError(f'호출 속도 제한이 없는 group: {group!r}'
+                                     ' (rate 를 지정해주십시오)')
+                limiter = self.limiters[group] = RateLimiter(rate, burst)
+            return limiter
+
+    def set_rate_limit(self, group, rate, burst=None):
+        '''엔드포인트 묶음(group)의 초당 호출 수 제한 변경'''
+
+        limiter = self.rate_limiter(group, rate, burst)
+        with limiter._lock:
+            limiter.rate = rate
+            limiter.burst = rate if burst is None else burst
+            limiter._tokens = min(limiter._tokens, limiter.burst)
+
+    def rate_limit(self, group, rate, burst=None):
+        '''with 블록 안에서만 group 의 초당 호출 수 제한을 rate 로 바꾸는 컨텍스트 관리자
+
+        블록이 끝나면 이전 제한(없었으면 제한 없음)으로 되돌린다.
+
+        [예시]
+        with client.rate_limit('vendor-items', 50):
+            ...
+        '''
+
+        import contextlib
+
+        @contextlib.contextmanager
+        def scope():
+            limiter = RateLimiter(rate, burst)
+            with self._limiters_lock:
+                previous = self.limiters.get(group)
+                self.limiters[group] = limiter
+            try:
+                yield limiter
+            finally:
+                with self._limiters_lock:
+                    # 그 사이에 다른 곳에서 바꾼 제한은 그대로 둔다
+                    if self.limiters.get(group) is limiter:
+                        if previous is None:
+                            del self.limiters[group]
+                        else:
+                            self.limiters[group] = previous
+
+        return scope()
+
+    def limiter_for(self, func):
+        '''@coupang 함수에 선언된 호출 속도 제한(없으면 None)
+
+        제한을 선언하지 않은 함수도 set_rate_limit() 으로 group 에
+        제한을 설정했으면 그 제한을 따른다.
+        '''
+
+        if func.rate is None:
+            return self.limiters.get(func.group)
+        return self.rate_limiter(func.group, func.rate)
+
+    def execute(self, req, limiter=None):
+        '''요청 명세(Request)를 서명, 전송, 디코딩하는 단일 파이프라인
+
+        재시도 정책과 호출 속도 제한(limiter)을 적용하며,
+        재시도할 때마다 새로 서명한다.
+        재시도할 수 없는 오류이거나 재시도를 모두 사용하면 예외를 그대로 올린다.
+        '''
+
+        policy = RETRY_POLICY if self.retry_policy is None \
+                else self.retry_policy
+        policy.budget.deposit()
+        url = req.url(self.base_url)
+        t = transport()
+        request = t.request
+        pool = self.pool
+        if pool is None:
+            pool = t.get_pool(self.host, self.port)
+        sign = self.signer.sign
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            authorization = sign(req.method, req.path, req.query)
+            try:
+                return request(
+                        req.method, url, authorization, req.body, pool)
+            except Exception as e:
+                if not policy.should_retry(e, attempt):
+                    raise
+                time.sleep(policy.delay(e, attempt))
+                attempt += 1
+
+    async def execute_async(self, req, limiter=None):
+        '''execute()의 asyncio 버전'''
+
+        import asyncio
+
+        policy = RETRY_POLICY if self.retry_policy is None \
+                else self.retry_policy
+        policy.budget.deposit()
+        url = req.url(self.base_url)
+        request_async = transport().request_async
+        pool = self.async_pool()
+        sign = self.signer.sign
+        attempt = 0
+        while True:
+            if limiter is not None:
+                await limiter.acquire_async()
+            authorization = sign(req.method, req.path, req.query)
+            try:
+                return await request_async(
+                        req.method, url, authorization, req.body, pool)
+            except Exception as e:
+                if not policy.should_retry(e, attempt):
+                    raise
+                await asyncio.sleep(policy.delay(e, attempt))
+                attempt += 1
+
+    def async_pool(self):
+        '''현재 이벤트 루프에서 사용할 전용 asyncio 풀(pool 을 넘기지 않았으면 None: 공유 풀)'''
+
+        if self.pool is None:
+            return None
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._limiters_lock:
+            # 닫힌 이벤트 루프의 풀은 버린다
+            for old in [l for l in self._async_pools if l.is_closed()]:
+                del self._async_pools[old]
+            pool = self._async_pools.get(loop)
+            if pool is None:
+                pool = self._async_pools[loop] = \
+                        transport().AsyncConnectionPool(
+                                self.host, self.port, size=self.pool.size,
+                                idle_timeout=self.pool.idle_timeout,
+                                timeout=self.pool.timeout)
+        return pool
+
+    async def close_async_pool(self):
+        '''현재 이벤트 루프의 전용 asyncio 풀을 닫는다(pool 을 넘긴 경우)'''
+
+        import asyncio
+
+        with self._limiters_lock:
+            pool = self._async_pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.clear()
+
+    def call(self, func, *args, **kwargs):
+        '''@coupang 함수를 이 클라이언트로 호출(오류는 예외로 올림)
+
+        [예시]
+        client.call(get_product_by_product_id, {'sellerProductId': '1'})
+        '''
+
+        req = func.spec(*args, **kwargs)
+        cache = self.cache if func.cache_ttl and req.method == 'GET' else None
+        if cache is not None:
+            response = cache.get(req.key())
+            if response is not MISSING:
+                return response
+
+        limiter = self.limiter_for(func)
+        if self.singleflight is not None and req.method == 'GET':
+            response = self.singleflight.do(
+                    req.key(), lambda: self.execute(req, limiter))
         else:
-            resp = urllib.request.urlopen(req, context=ctx)
+            response = self.execute(req, limiter)
+        if cache is not None:
+            ttl = response_ttl(func, response)
+            if ttl:
+                cache.set(req.key(), response, ttl, func.__name__)
+        elif func.invalidates and self.cache is not None:
+            for tag in func.invalidates:
+                self.cache.invalidate(tag=tag)
+        return response
 
-    except urllib.request.HTTPError as e:
-        print("=" * 80)
-        print(f"[HTTP Error] {e.code} - {e.reason}")
-        print(f"URL: {e.url}")
-        print(f"Headers: {dict(e.headers)}")
-        try:
-            error_body = e.read().decode('utf-8')
-            print(f"Response Body:\n{error_body}")
-        except Exception:
-            print("Response Body: (읽기 실패)")
-        print("=" * 80)
-        raise e
-    except urllib.request.URLError as e:
-        print("=" * 80)
-        print(f"[URL Error] {type(e).__name__}")
-        print(f"Reason: {e.reason}")
-        if hasattr(e, 'errno'):
-            print(f"Error Code: {e.errno}")
-        print(f"URL: {url if 'url' in locals() else 'N/A'}")
-        print("=" * 80)
-        raise e
-    else:
-        # 200
-        decoded_resp = resp.read().decode(resp.headers.get_content_charset())
-        response = json.loads(decoded_resp)
+    async def acall(self, func, *args, **kwargs):
+        '''call()의 asyncio 버전'''
+
+        req = func.spec(*args, **kwargs)
+        cache = self.cache if func.cache_ttl and req.method == 'GET' else None
+        if cache is not None:
+            response = cache.get(req.key())
+            if response is not MISSING:
+                return response
+
+        limiter = self.limiter_for(func)
+        if self.singleflight is not None and req.method == 'GET':
+            response = await self.singleflight.do_async(
+                    req.key(), lambda: self.execute_async(req, limiter))
+        else:
+            response = await self.execute_async(req, limiter)
+        if cache is not None:
+            ttl = response_ttl(func, response)
+            if ttl:
+                cache.set(req.key(), response, ttl, func.__name__)
+        elif func.invalidates and self.cache is not None:
+            for tag in func.invalidates:
+                self.cache.invalidate(tag=tag)
         return response
 
+    def enable_cache(self, maxsize=1024, path=None):
+        '''응답 캐시 사용(cache_ttl 이 선언된 조회 API 에만 적용)
+
+        path: 응답을 함께 저장할 SQLite 파일(선택, 재시작 후에도 사용)
+        '''
+
+        if self.cache is None:
+            store = None if path is None else DiskStore(path)
+            self.cache = ResponseCache(maxsize, store)
+        return self.cache
+
+    def invalidate(self, func=None, *args, **kwargs):
+        '''응답 캐시 무효화
+
+        [예시]
+        client.invalidate()  # 전체
+        client.invalidate(outbound_shipping_place)  # 해당 API 전체
+        client.invalidate(get_category, {'displayCategoryCode': 1})  # 한 건
+        '''
+
+        if self.cache is None:
+            return
+        if func is None:
+            self.cache.invalidate()
+        elif args or kwargs:
+            self.cache.invalidate(key=func.spec(*args, **kwargs).key())
+        else:
+            self.cache.invalidate(tag=func.__name__)
+
+    def bind(self, func):
+        '''@coupang 함수를 이 클라이언트로 호출하는 함수를 만든다'''
+
+        client = self
+
+        @wraps(func)
+        def bound(*args, **kwargs):
+            try:
+                return client.call(func, *args, **kwargs)
+            except Exception:
+                if client.raise_errors:
+                    raise
+                return None
+
+        @wraps(func)
+        async def bound_aio(*args, **kwargs):
+            try:
+                return await client.acall(func, *args, **kwargs)
+            except Exception:
+                if client.raise_errors:
+                    raise
+                return None
+
+        bound.aio = bound_aio
+        return bound
+
+    def close(self):
+        '''클라이언트가 단독으로 사용하는 커넥션 풀을 닫는다'''
+
+        if self.pool is not None:
+            self.pool.clear()
+
+
+class Endpoints:
+    '''클라이언트에 연결된 API 모듈(client.product 등)
+
+    모듈의 @coupang 함수를 클라이언트로 호출하는 함수로 바꿔서 돌려준다.
+    client 인자를 받는 함수(iter_ordersheets 등)는 client 를 이 클라이언트로 채워서 돌려준다.
+    그 밖의 속성은 모듈의 것을 그대로 돌려준다.
+    '''
+
+    def __init__(self, client, module):
+        self._client = client
+        self._module = module
+
+    def __repr__(self):
+        return f"<{self._module.__name__} endpoints of {self._client!r}>"
+
+    def __dir__(self):
+        return dir(self._module)
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if callable(attr) and hasattr(attr, 'spec'):
+            attr = self._client.bind(attr)
+            setattr(self, name, attr)
+        elif takes_client(attr):
+            attr = partial(attr, client=self._client)
+            setattr(self, name, attr)
+        return attr
+
+
+def takes_client(func):
+    '''client 인자를 받는 일반 함수인지'''
+
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return False
+    names = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+    return 'client' in names
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def default_client():
+    '''coupang.ini 의 계정으로 만든 기본 클라이언트
+
+    모듈 함수(coupang.product.get_products_by_query 등)는 이 클라이언트로 호출된다.
+    '''
+
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                secretkey, accesskey, vendor_id = load_config()
+                _default_client = CoupangClient(accesskey, secretkey, vendor_id)
+    return _default_client
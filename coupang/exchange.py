@@ -83,3 +83,52 @@ def update_invoice_exchange_request(body):
             'body': json.dumps(body).encode('utf-8')
     }
 
+
+
+##############################################################################
+# 교환 기간 조회                                                             #
+##############################################################################
+
+
+# 한 번에 조회할 구간 크기
+EXCHANGE_WINDOW_DAYS = 7
+
+
+def iter_exchange_requests(start, end, status=None, vendor_id=None,
+                           workers=4, max_per_page=50, client=None):
+    '''기간 제한 없이 교환 요청 목록을 조회하는 제너레이터
+
+    기간을 7일 구간으로 나누어 workers 개 구간을 동시에 조회하고,
+    구간마다 nextToken 을 따라 모든 페이지를 받는다.
+    구간 경계에서 중복된 교환(exchangeId)은 한 번만 반환하며, 접수일시 순서로 반환한다.
+    end 가 날짜('yyyy-mm-dd')이면 그 날짜 전체를 포함한다.
+
+    [예시]
+    for exchange in iter_exchange_requests('2024-01-01', '2024-01-31'):
+        print(exchange['exchangeId'])
+    '''
+
+    import datetime
+    from coupang.common import default_client
+    from coupang.pagination import (
+            iter_window_items, time_windows, parse_time, has_time)
+
+    if client is None:
+        client = default_client()
+    if vendor_id is None:
+        vendor_id = client.vendor_id
+    if not has_time(end):
+        end = parse_time(end) + datetime.timedelta(days=1, seconds=-1)
+
+    query = {'maxPerPage': max_per_page}
+    if status is not None:
+        query['status'] = status
+    windows = time_windows(start, end,
+                           datetime.timedelta(days=EXCHANGE_WINDOW_DAYS),
+                           '%Y-%m-%dT%H:%M:%S')
+
+    return iter_window_items(
+            get_exchange_request, windows, query,
+            key=lambda exchange: exchange.get('exchangeId'),
+            sort_key=lambda exchange: exchange.get('createdAt') or '',
+            workers=workers, client=client, path={'vendorId': vendor_id})
@@ -0,0 +1,228 @@
+import csv
+import json
+import time
+import sqlite3
+from coupang.common import default_client
+
+
+##############################################################################
+# 송장번호 사용 이력                                                         #
+##############################################################################
+
+
+# 같은 송장번호를 다시 사용할 수 없는 기간(초, 약 6개월)
+REUSE_PERIOD = 60 * 60 * 24 * 183
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS invoices (
+    invoice_number TEXT PRIMARY KEY,
+    shipment_box_id INTEGER,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS invoices_used_at ON invoices (used_at);
+'''
+
+
+class InvoiceIndex:
+    '''최근 6개월 동안 사용한 송장번호를 보관하는 로컬 색인(SQLite)
+
+    [예시]
+    index = InvoiceIndex('invoices.db')
+    index.used('123456789012')  # False
+    index.add('123456789012', 1234567)
+    index.add_many([('123456789013', 1234568), ('123456789014', 1234569)])
+    '''
+
+    def __init__(self, path='invoices.db', period=REUSE_PERIOD):
+        self.period = period
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        self.prune()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM invoices').fetchone()[0]
+
+    def used(self, invoice_number, now=None):
+        '''재사용할 수 없는(기간 안에 사용한) 송장번호인지'''
+
+        if now is None:
+            now = time.time()
+        row = self.db.execute(
+                'SELECT used_at FROM invoices WHERE invoice_number = ?',
+                (str(invoice_number),)).fetchone()
+        return row is not None and row[0] > now - self.period
+
+    def add(self, invoice_number, shipment_box_id=None, now=None):
+        self.add_many([(invoice_number, shipment_box_id)], now)
+
+    def add_many(self, invoices, now=None):
+        '''(송장번호, 묶음배송번호) 목록을 한 번에 기록(커밋 1회)'''
+
+        if now is None:
+            now = time.time()
+        self.db.executemany(
+                'INSERT OR REPLACE INTO invoices'
+                ' (invoice_number, shipment_box_id, used_at) VALUES (?, ?, ?)',
+                [(str(number), box, now) for number, box in invoices])
+        self.db.commit()
+
+    def prune(self, now=None):
+        '''기간이 지난 송장번호 삭제'''
+
+        if now is None:
+            now = time.time()
+        self.db.execute('DELETE FROM invoices WHERE used_at <= ?',
+                        (now - self.period,))
+        self.db.commit()
+
+
+##############################################################################
+# 송장 파일 읽기                                                             #
+##############################################################################
+
+
+INT_FIELDS = ('shipmentBoxId', 'orderId', 'vendorItemId')
+BOOL_FIELDS = ('splitShipping', 'preSplitShipped')
+
+
+def invoice_row(row):
+    '''CSV/NDJSON 한 줄을 orderSheetInvoiceApplyDtos 항목 형식으로 변환'''
+
+    row = {k: v for k, v in row.items() if v not in (None, '')}
+    for k in INT_FIELDS:
+        if k in row:
+            row[k] = int(row[k])
+    for k in BOOL_FIELDS:
+        value = row.get(k, False)
+        if isinstance(value, str):
+            value = value.strip().lower() in ('true', '1', 'y', 'yes')
+        row[k] = value
+    row['invoiceNumber'] = str(row['invoiceNumber'])
+    row.setdefault('estimatedShippingDate', '')
+    return row
+
+
+def read_invoices(path, format=None, encoding='utf-8'):
+    '''택배사 송장 파일(CSV 또는 NDJSON)을 한 줄씩 읽는 제너레이터
+
+    열(키) 이름은 송장 업로드 API 와 같다.
+    (shipmentBoxId, orderId, vendorItemId, deliveryCompanyCode, invoiceNumber,
+     splitShipping, preSplitShipped, estimatedShippingDate)
+    format: 'csv' 또는 'ndjson'(기본값: 확장자로 판단)
+    '''
+
+    if format is None:
+        format = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    with open(path, encoding=encoding, newline='') as f:
+        if format == 'csv':
+            for row in csv.DictReader(f):
+                yield invoice_row(row)
+        else:
+            for line in f:
+                if line.strip():
+                    yield invoice_row(json.loads(line))
+
+
+##############################################################################
+# 송장 일괄 업로드                                                           #
+##############################################################################
+
+
+INVOICE_BATCH = 50
+
+
+def upload_invoices(rows, index=None, vendor_id=None, batch_size=INVOICE_BATCH,
+                    workers=4, client=None):
+    '''송장 목록을 묶어서 동시에 업로드하고, 줄마다 (row, 성공 여부, 메시지)를 반환하는 제너레이터
+
+    rows 는 한 줄씩 읽으며(read_invoices), batch_size 개씩 묶어 workers 개 묶음을 동시에 보낸다.
+    index(InvoiceIndex)를 넘기면 6개월 안에 사용한 송장번호나
+    같은 파일에서 보내는 중이거나 업로드에 성공한 송장번호는 API 를 호출하지 않고 실패로 반환하며,
+    업로드에 성공한 송장번호는 index 에 기록한다.
+    (업로드에 실패한 송장번호는 같은 파일의 뒤쪽 줄에서 다시 보낼 수 있다)
+
+    [예시]
+    with InvoiceIndex('invoices.db') as index:
+        for row, ok, message in upload_invoices(
+                read_invoices('invoices.csv'), index, workers=8):
+            if not ok:
+                print(row['shipmentBoxId'], message)
+    '''
+
+    from coupang.ordersheet import update_order_shipping_info
+    from coupang.pagination import iter_windows
+
+    if client is None:
+        client = default_client()
+    if vendor_id is None:
+        vendor_id = client.vendor_id
+
+    sent = set()  # 보내는 중이거나 업로드에 성공한 송장번호(실패하면 뺀다)
+
+    def batches():
+        batch, rejected = [], []
+        for row in rows:
+            number = row['invoiceNumber']
+            if index is not None and number in sent:
+                rejected.append((row, '이번 업로드에서 이미 보낸 송장번호'))
+            elif index is not None and index.used(number):
+                rejected.append((row, '6개월 이내에 사용한 송장번호'))
+            else:
+                sent.add(number)
+                batch.append(row)
+            if len(batch) + len(rejected) >= batch_size:
+                yield batch, rejected
+                batch, rejected = [], []
+        if batch or rejected:
+            yield batch, rejected
+
+    def send(batch):
+        batch, rejected = batch
+        results = [(row, False, message) for row, message in rejected]
+        if batch:
+            uploaded = upload(batch)
+            for row, ok, message in uploaded:
+                if not ok:
+                    sent.discard(row['invoiceNumber'])
+            results += uploaded
+        return results
+
+    def upload(batch):
+        try:
+            response = client.call(update_order_shipping_info, {
+                    'vendorId': vendor_id,
+                    'orderSheetInvoiceApplyDtos': batch})
+        except Exception as e:
+            return [(row, False, str(e)) for row in batch]
+
+        data = response.get('data') or {}
+        # 넘긴 번호가 문자열이어도 찾을 수 있도록 문자열로 비교
+        by_box = {str(r.get('shipmentBoxId')): r
+                  for r in data.get('responseList') or ()}
+        results = []
+        for row in batch:
+            r = by_box.get(str(row.get('shipmentBoxId')))
+            if r is None:
+                ok = data.get('responseCode') == 0
+                results.append((row, ok, data.get('responseMessage')))
+            else:
+                results.append((row, bool(r.get('succeed')),
+                                r.get('resultMessage')))
+        return results
+
+    # 묶음 단위로 받아 성공한 송장번호를 한 번에 기록
+    for results in iter_windows(lambda batch: [send(batch)], batches(),
+                                workers):
+        if index is not None:
+            index.add_many([(row['invoiceNumber'], row.get('shipmentBoxId'))
+                            for row, ok, _ in results if ok])
+        yield from results
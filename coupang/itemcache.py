@@ -0,0 +1,148 @@
+import threading
+from coupang.common import default_client, MISSING
+
+
+##############################################################################
+# 아이템 상태 캐시                                                           #
+##############################################################################
+
+
+# op -> (API 함수 이름, 상태 필드, 인자 이름)
+OPERATIONS = {
+        'price': ('update_product_price_by_item', 'salePrice', 'price'),
+        'quantity': ('update_product_quantity_by_item', 'amountInStock',
+                     'quantity'),
+        'stop': ('stop_product_sales_by_item', 'onSale', None),
+        'resume': ('resume_product_sales_by_item', 'onSale', None),
+}
+
+# op 별로 기록할 상태 값(value 대신 사용)
+FIXED_VALUES = {'stop': False, 'resume': True}
+
+# 상태 필드 -> 값 변환(CSV 의 '15000' 과 응답의 15000 을 같은 값으로 비교)
+FIELD_TYPES = {'salePrice': int, 'amountInStock': int, 'onSale': bool}
+
+
+def operation(op):
+    '''op 이름에 해당하는 (API 함수, 상태 필드, 인자 이름)'''
+
+    from coupang import product
+
+    try:
+        name, field, arg = OPERATIONS[op]
+    except KeyError:
+        raise ValueError(f'알 수 없는 작업: {op!r}') from None
+    return getattr(product, name), field, arg
+
+
+class ItemStateCache:
+    '''옵션ID(vendorItemId)별로 마지막으로 알려진 가격, 재고, 판매상태
+
+    apply() 는 바꾸려는 값이 캐시된 값과 같으면 API 를 호출하지 않는다.
+    옵션ID, 가격, 재고는 int 로 바꿔서 비교하고 보관한다.
+    호출이 성공하면 캐시를 새 값으로 바꾸고, 실패하면 해당 옵션의 캐시를 지운다.
+    (실패한 요청이 실제로 반영되었는지 알 수 없기 때문)
+    여러 스레드에서 함께 사용해도 안전하다.
+
+    [예시]
+    cache = ItemStateCache()
+    cache.load([3000000000, 3000000001])  # 현재 상태 조회
+    cache.apply(3000000000, 'price', 15000)  # 같은 가격이면 호출하지 않음
+    cache.apply(3000000001, 'stop')
+    '''
+
+    def __init__(self, client=None):
+        self.client = default_client() if client is None else client
+        self.sent = 0
+        self.skipped = 0
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, vendor_item_id):
+        '''캐시된 상태(salePrice, amountInStock, onSale), 없으면 None'''
+
+        with self._lock:
+            state = self._data.get(int(vendor_item_id))
+            return None if state is None else dict(state)
+
+    def seed(self, vendor_item_id, state):
+        '''상태를 캐시에 기록
+
+        state: get_product_quantity_price_status 의 data 형식
+            {'salePrice': 5700, 'amountInStock': 100, 'onSale': True}
+            (일부 필드만 있어도 됨)
+        '''
+
+        fields = {k: convert(state[k]) for k, convert in FIELD_TYPES.items()
+                  if state.get(k) is not None}
+        vendor_item_id = int(vendor_item_id)
+        with self._lock:
+            self._data.setdefault(vendor_item_id, {}).update(fields)
+
+    def seed_all(self, states):
+        '''(vendorItemId, state) 목록 또는 vendorItemId 가 들어 있는 state 목록을 기록'''
+
+        for state in states:
+            if isinstance(state, tuple):
+                self.seed(*state)
+            else:
+                self.seed(state['vendorItemId'], state)
+
+    def load(self, vendor_item_ids, workers=8):
+        '''get_product_quantity_price_status 로 현재 상태를 조회해 캐시에 기록'''
+
+        from coupang.product import get_product_quantity_price_status
+        from coupang.pagination import iter_windows
+
+        def fetch(vendor_item_id):
+            response = self.client.call(get_product_quantity_price_status,
+                                        {'vendorItemId': vendor_item_id})
+            return [(vendor_item_id, response.get('data') or {})]
+
+        self.seed_all(iter_windows(fetch, vendor_item_ids, workers))
+
+    def invalidate(self, vendor_item_id=None):
+        '''해당 옵션(없으면 전체)의 캐시 삭제'''
+
+        with self._lock:
+            if vendor_item_id is None:
+                self._data.clear()
+            else:
+                self._data.pop(int(vendor_item_id), None)
+
+    def apply(self, vendor_item_id, op, value=None):
+        '''가격/재고/판매상태 변경(바뀌지 않으면 호출하지 않음)
+
+        op: 'price', 'quantity', 'stop', 'resume'
+        API 를 호출했으면 True, 값이 같아 건너뛰었으면 False 를 반환하고,
+        호출이 실패하면 예외를 올린다.
+        '''
+
+        func, field, arg = operation(op)
+        value = FIELD_TYPES[field](FIXED_VALUES.get(op, value))
+        vendor_item_id = int(vendor_item_id)
+        with self._lock:
+            state = self._data.get(vendor_item_id)
+            if state is not None and state.get(field, MISSING) == value:
+                self.skipped += 1
+                return False
+
+        path = {'vendorItemId': vendor_item_id}
+        if arg is not None:
+            path[arg] = value
+        try:
+            self.client.call(func, path)
+        except Exception:
+            self.invalidate(vendor_item_id)
+            raise
+        with self._lock:
+            self.sent += 1
+            self._data.setdefault(vendor_item_id, {})[field] = value
+        return True
+
+    def stats(self):
+        return {'sent': self.sent, 'skipped': self.skipped,
+                'size': len(self._data)}
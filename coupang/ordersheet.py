@@ -3,6 +3,62 @@ import urllib.parse
 from coupang.common import coupang
 
 
+##############################################################################
+# 발주서 조회 캐시 유지 시간                                                 #
+##############################################################################
+
+
+# 더 이상 바뀌지 않는 발주서 상태(응답을 무효화 전까지 캐시)
+TERMINAL_STATUSES = frozenset(('FINAL_DELIVERY',))
+
+# 진행 중인 발주서 응답의 캐시 유지 시간(초)
+IN_FLIGHT_TTL = 30
+
+# 발주서 상태를 바꾸는 API 를 호출하면 비울 조회 API
+ORDERSHEET_LOOKUPS = (
+        'get_ordersheet_by_shipmentboxid', 'get_ordersheet_by_orderid',
+        'get_ordersheet_history')
+
+
+def ordersheet_ttl(response):
+    '''발주서 조회 응답의 캐시 유지 시간
+
+    응답의 발주서가 모두 최종 상태(배송완료)이면 계속 보관하고, 아니면 30초
+    '''
+
+    data = response.get('data')
+    sheets = data if isinstance(data, list) else [data]
+    statuses = [sheet.get('status') for sheet in sheets
+                if isinstance(sheet, dict)]
+    if statuses and all(status in TERMINAL_STATUSES for status in statuses):
+        return float('inf')
+    return IN_FLIGHT_TTL
+
+
+def history_ttl(response):
+    '''배송상태 변경 히스토리 응답의 캐시 유지 시간
+
+    이력에 최종 상태(배송완료)가 있으면 계속 보관하고, 아니면 30초
+    '''
+
+    def statuses(data):
+        if isinstance(data, list):
+            for entry in data:
+                yield from statuses(entry)
+        elif isinstance(data, dict):
+            for key in ('status', 'deliveryStatus'):
+                if key in data:
+                    yield data[key]
+            for value in data.values():
+                if isinstance(value, list):
+                    yield from statuses(value)
+
+    if any(status in TERMINAL_STATUSES
+           for status in statuses(response.get('data'))):
+        return float('inf')
+    return IN_FLIGHT_TTL
+
+
 ##############################################################################
 # 배송(일부 환불) 관련 함수                                                  #
 ##############################################################################
@@ -30,7 +86,7 @@ def get_ordersheet(path, query):
     }
 
 
-@coupang
+@coupang(cache_ttl=ordersheet_ttl)
 def get_ordersheet_by_shipmentboxid(path):
     '''발주서 조회
 
@@ -45,7 +101,7 @@ def get_ordersheet_by_shipmentboxid(path):
     }
 
 
-@coupang
+@coupang(cache_ttl=ordersheet_ttl)
 def get_ordersheet_by_orderid(path):
     '''발주서 조회
 
@@ -60,7 +116,7 @@ def get_ordersheet_by_orderid(path):
     }
 
 
-@coupang
+@coupang(cache_ttl=history_ttl)
 def get_ordersheet_history(path):
     '''배송상태 변경 히스토리 조회
 
@@ -75,7 +131,7 @@ def get_ordersheet_history(path):
     }
 
 
-@coupang
+@coupang(invalidates=ORDERSHEET_LOOKUPS)
 def update_ordersheet_status(body):
     '''주문상태를 '결제완료'에서 '상품준비중'으로 변경
 
@@ -91,7 +147,7 @@ def update_ordersheet_status(body):
     }
 
 
-@coupang
+@coupang(invalidates=ORDERSHEET_LOOKUPS)
 def update_order_shipping_info(body):
     '''송장 업로드
 
@@ -107,7 +163,7 @@ def update_order_shipping_info(body):
     }
 
 
-@coupang
+@coupang(invalidates=ORDERSHEET_LOOKUPS)
 def update_order_invoice(body):
     '''송장 업데이트(수정)
 
@@ -130,7 +186,7 @@ def update_order_invoice(body):
     }
 
 
-@coupang
+@coupang(invalidates=ORDERSHEET_LOOKUPS)
 def stop_return_request_shipment(body):
     '''출고중지 완료
     
@@ -152,7 +208,7 @@ def stop_return_request_shipment(body):
     }
 
 
-@coupang
+@coupang(invalidates=ORDERSHEET_LOOKUPS)
 def stop_return_request_by_receipt(body):
     '''이미출고
 
@@ -178,7 +234,7 @@ def stop_return_request_by_receipt(body):
     }
 
 
-@coupang
+@coupang(invalidates=ORDERSHEET_LOOKUPS)
 def cancel_order_processing(body):
     '''주문상품 취소
 
@@ -199,7 +255,7 @@ def cancel_order_processing(body):
     }
 
 
-@coupang
+@coupang(invalidates=ORDERSHEET_LOOKUPS)
 def update_invoice_delivery_by_invoice_no(path, body):
     '''장기미배송 배송완료 처리
 
@@ -217,3 +273,79 @@ def update_invoice_delivery_by_invoice_no(path, body):
             'body': json.dumps(body).encode('utf-8')
     }
 
+
+
+##############################################################################
+# 발주서 기간 조회                                                           #
+##############################################################################
+
+
+# get_ordersheet 로 한 번에 조회할 수 있는 최대 기간
+DAY_WINDOW_DAYS = 31
+TIMEFRAME_WINDOW_HOURS = 24
+
+
+def ordersheet_windows(start, end, timeframe=False):
+    '''start ~ end 기간을 get_ordersheet 로 조회할 수 있는 구간으로 나눈다
+
+    일단위: 31일씩(양 끝 날짜 포함, 구간끼리 겹치지 않음)
+    분단위: 24시간씩(경계 시각은 이웃 구간과 겹침)
+
+    [예시]
+    list(ordersheet_windows('2024-01-01', '2024-03-31'))
+    [('2024-01-01', '2024-01-31'), ('2024-02-01', '2024-03-02'),
+     ('2024-03-03', '2024-03-31')]
+    '''
+
+    import datetime
+    from coupang.pagination import date_windows, time_windows
+
+    if timeframe:
+        return time_windows(start, end, datetime.timedelta(
+                hours=TIMEFRAME_WINDOW_HOURS))
+    return date_windows(start, end, DAY_WINDOW_DAYS)
+
+
+def iter_ordersheets(status, start, end, vendor_id=None, timeframe=None,
+                     workers=4, max_per_page=50, client=None, records=False):
+    '''기간 제한 없이 발주서를 조회하는 제너레이터
+
+    기간을 조회 가능한 구간(일단위 31일, 분단위 24시간)으로 나누어
+    workers 개 구간을 동시에 조회하고, 구간마다 nextToken 을 따라 모든 페이지를 받는다.
+    구간 경계에서 중복으로 조회된 발주서(shipmentBoxId)는 한 번만 반환하며,
+    주문일시(orderedAt) 순서로 반환한다.
+
+    timeframe: 분단위 조회(searchType=timeFrame) 여부
+        (기본값: start 또는 end 에 시각이 있으면 분단위)
+    vendor_id: 기본값은 클라이언트의 판매자 ID
+    client: 사용할 CoupangClient(기본값: coupang.ini 의 기본 클라이언트)
+    records: True 이면 dict 대신 OrderSheet 레코드(coupang.records)를 반환
+
+    [주의]
+    호출이 실패하면 예외가 발생한다.
+    동시에 조회 중인 구간(최대 workers 개)의 발주서는 메모리에 보관한다.
+
+    [예시]
+    for sheet in iter_ordersheets('ACCEPT', '2024-01-01', '2024-03-31'):
+        print(sheet['shipmentBoxId'], sheet['orderedAt'])
+    '''
+
+    from coupang.common import default_client
+    from coupang.pagination import iter_window_items, has_time
+
+    if client is None:
+        client = default_client()
+    if vendor_id is None:
+        vendor_id = client.vendor_id
+    if timeframe is None:
+        timeframe = has_time(start) or has_time(end)
+
+    query = {'status': status, 'maxPerPage': max_per_page}
+    if timeframe:
+        query['searchType'] = 'timeFrame'
+    return iter_window_items(
+            get_ordersheet, ordersheet_windows(start, end, timeframe), query,
+            key=lambda sheet: sheet.get('shipmentBoxId'),
+            sort_key=lambda sheet: sheet.get('orderedAt') or '',
+            workers=workers, client=client, path={'vendorId': vendor_id},
+            records=records)
@@ -0,0 +1,168 @@
+import json
+import sqlite3
+import hashlib
+import datetime
+from coupang.common import default_client
+
+
+##############################################################################
+# 발주서 증분 동기화                                                         #
+##############################################################################
+
+
+# 발주서 상태
+ORDER_STATUSES = (
+        'ACCEPT', 'INSTRUCT', 'DEPARTURE',
+        'DELIVERING', 'FINAL_DELIVERY', 'NONE_TRACKING')
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS watermarks (
+    vendor_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    watermark TEXT NOT NULL,
+    PRIMARY KEY (vendor_id, status)
+);
+CREATE TABLE IF NOT EXISTS ordersheets (
+    vendor_id TEXT NOT NULL,
+    shipment_box_id INTEGER NOT NULL,
+    status TEXT,
+    ordered_at TEXT,
+    digest TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (vendor_id, shipment_box_id)
+);
+CREATE INDEX IF NOT EXISTS ordersheets_status
+    ON ordersheets (vendor_id, status);
+'''
+
+
+def digest(sheet):
+    '''발주서 변경 여부 비교용 해시'''
+
+    data = json.dumps(sheet, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest(), data
+
+
+class OrderSync:
+    '''발주서 증분 동기화
+
+    상태별로 마지막 동기화 시각(watermark)을 SQLite 파일에 저장하고,
+    [watermark - overlap, now] 구간만 분단위(timeFrame)로 조회한다.
+    조회한 발주서는 shipmentBoxId 로 저장(upsert)하며,
+    새로 생겼거나 내용이 바뀐 발주서에 대해서만 on_change(sheet, previous)를 호출한다.
+    (previous: 이전에 저장된 발주서, 새 발주서이면 None)
+
+    on_change 호출이 끝난 뒤 상태별로 저장(commit)하므로,
+    on_change 에서 예외가 나면 해당 상태는 다음 sync() 때 다시 전달된다.
+
+    [예시]
+    sync = OrderSync('orders.db', on_change=lambda sheet, previous: print(sheet))
+    while True:
+        sync.sync()
+        time.sleep(60)
+    '''
+
+    def __init__(self, path='orders.db', statuses=ORDER_STATUSES,
+                 vendor_id=None, client=None, on_change=None,
+                 overlap=datetime.timedelta(minutes=5),
+                 initial=datetime.timedelta(days=1), workers=4):
+        self.client = default_client() if client is None else client
+        self.vendor_id = self.client.vendor_id if vendor_id is None \
+                else vendor_id
+        self.statuses = statuses
+        self.on_change = on_change
+        self.overlap = overlap
+        self.initial = initial
+        self.workers = workers
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def watermark(self, status):
+        '''해당 상태의 마지막 동기화 시각(datetime, 없으면 None)'''
+
+        row = self.db.execute(
+                'SELECT watermark FROM watermarks'
+                ' WHERE vendor_id = ? AND status = ?',
+                (self.vendor_id, status)).fetchone()
+        return None if row is None else \
+                datetime.datetime.strptime(row[0], TIME_FORMAT)
+
+    def get(self, shipment_box_id):
+        '''저장된 발주서(없으면 None)'''
+
+        row = self.db.execute(
+                'SELECT data FROM ordersheets'
+                ' WHERE vendor_id = ? AND shipment_box_id = ?',
+                (self.vendor_id, shipment_box_id)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def sync(self, now=None):
+        '''모든 상태를 한 번 동기화하고, 새로 생기거나 바뀐 발주서 목록을 반환
+
+        now: 조회 기준 시각(KST, 기본값: 현재 KST 시각)
+        '''
+
+        from coupang.ordersheet import iter_ordersheets
+
+        if now is None:
+            from coupang.pagination import now_kst
+            now = now_kst()
+        now = now.replace(second=0, microsecond=0)
+
+        changed = []
+        for status in self.statuses:
+            watermark = self.watermark(status)
+            start = now - self.initial if watermark is None \
+                    else watermark - self.overlap
+            if start >= now:
+                continue
+
+            sheets = iter_ordersheets(
+                    status, start, now, vendor_id=self.vendor_id,
+                    timeframe=True, workers=self.workers, client=self.client)
+            try:
+                for sheet in sheets:
+                    if self.upsert(sheet):
+                        changed.append(sheet)
+                self.db.execute(
+                        'INSERT OR REPLACE INTO watermarks'
+                        ' (vendor_id, status, watermark) VALUES (?, ?, ?)',
+                        (self.vendor_id, status, now.strftime(TIME_FORMAT)))
+            except BaseException:
+                self.db.rollback()
+                raise
+            self.db.commit()
+        return changed
+
+    def upsert(self, sheet):
+        '''발주서를 저장하고, 새로 생기거나 바뀌었으면 on_change 호출 후 True 반환'''
+
+        box = sheet.get('shipmentBoxId')
+        h, data = digest(sheet)
+        row = self.db.execute(
+                'SELECT digest, data FROM ordersheets'
+                ' WHERE vendor_id = ? AND shipment_box_id = ?',
+                (self.vendor_id, box)).fetchone()
+        if row is not None and row[0] == h:
+            return False
+
+        self.db.execute(
+                'INSERT OR REPLACE INTO ordersheets'
+                ' (vendor_id, shipment_box_id, status, ordered_at, digest, data)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (self.vendor_id, box, sheet.get('status'),
+                 sheet.get('orderedAt'), h, data))
+        if self.on_change is not None:
+            self.on_change(sheet, None if row is None else json.loads(row[1]))
+        return True
@@ -0,0 +1,473 @@
+from coupang.common import default_client
+from coupang.records import record_type
+
+
+##############################################################################
+# 응답 해석 함수                                                             #
+##############################################################################
+
+
+# 목록이 들어 있는 필드 이름(찾는 순서대로)
+ITEMS_KEYS = ('content', 'orders', 'inventories', 'items')
+
+
+def page_items(response, items_key=None):
+    '''응답에서 목록(list)을 꺼낸다
+
+    data 가 list 이면 그대로, dict 이면 items_key(없으면 ITEMS_KEYS 순서)로 찾는다.
+    data 가 없는 응답(출고지 조회 등)은 최상위에서 찾는다.
+    '''
+
+    data = response.get('data', response)
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return []
+    if items_key is not None:
+        return data.get(items_key) or []
+    for key in ITEMS_KEYS:
+        items = data.get(key)
+        if isinstance(items, list):
+            return items
+    return []
+
+
+def next_token(response, token_key='nextToken'):
+    '''응답에서 다음 페이지 토큰을 꺼낸다(없으면 None)
+
+    최상위 또는 data 안에 있는 토큰을 모두 찾는다.
+    '''
+
+    token = response.get(token_key)
+    if not token:
+        data = response.get('data')
+        if isinstance(data, dict):
+            token = data.get(token_key)
+    return token or None
+
+
+def total_pages(response):
+    '''응답에서 전체 페이지 수를 꺼낸다(없으면 None)'''
+
+    for holder in (response, response.get('data'), response.get('pagination')):
+        if isinstance(holder, dict) and holder.get('totalPages') is not None:
+            return int(holder['totalPages'])
+    return None
+
+
+##############################################################################
+# nextToken 페이지 순회                                                      #
+##############################################################################
+
+
+def fetch_page(client, func, query, path=None):
+    args = (query,) if path is None else (path, query)
+    response = client.call(func, *args)
+    if response is None:
+        raise ValueError(f'{func.__name__}: 빈 응답')
+    return response
+
+
+def iter_pages(func, query, token_key='nextToken', page_key=None,
+               prefetch=False, client=None, path=None):
+    '''nextToken 을 따라가며 페이지(응답 dict)를 하나씩 반환하는 제너레이터
+
+    func: query 하나를 받는 @coupang 조회 함수
+        (get_rocketgrowth_orders, get_rocketwarehouse_inventory,
+         get_rocketgrowth_products_by_query, get_products_by_query,
+         get_revenue_history 등)
+    page_key: 토큰 대신 페이지 번호(예: 'page')로 넘기는 API 인 경우 지정
+        (쿠폰 목록 조회 등, totalPages 나 빈 페이지가 나올 때까지 순회)
+    prefetch: True 이면 현재 페이지를 처리하는 동안
+        다음 페이지를 백그라운드 스레드에서 미리 받아온다
+    client: 사용할 CoupangClient(기본값: coupang.ini 의 기본 클라이언트)
+    path: (path, query) 를 받는 함수(get_ordersheet 등)의 path
+
+    메모리에는 최대 두 페이지(prefetch 시)만 유지한다.
+    호출이 실패하면 예외를 그대로 올린다.
+
+    [예시]
+    for page in iter_pages(get_rocketgrowth_orders, {
+            'vendorId': 'A00012345',
+            'paidDateFrom': '20240101', 'paidDateTo': '20240131'}):
+        ...
+    '''
+
+    if client is None:
+        client = default_client()
+
+    query = dict(query)
+    executor = None
+    if prefetch:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    try:
+        pending = None
+        response = fetch_page(client, func, query, path)
+        seen = set()
+        while True:
+            query = next_query(response, query, token_key, page_key, seen)
+            if query is not None and executor is not None:
+                pending = executor.submit(
+                        fetch_page, client, func, query, path)
+
+            yield response
+
+            if query is None:
+                return
+            if pending is not None:
+                response = pending.result()
+                pending = None
+            else:
+                response = fetch_page(client, func, query, path)
+    finally:
+        if executor is not None:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+
+
+def next_query(response, query, token_key, page_key, seen):
+    '''다음 페이지를 요청할 query(마지막 페이지면 None)'''
+
+    if page_key is not None:
+        page = int(query.get(page_key, 0))
+        pages = total_pages(response)
+        if (pages is not None and page + 1 >= pages) \
+                or not page_items(response):
+            return None
+        return dict(query, **{page_key: page + 1})
+
+    token = next_token(response, token_key)
+    if token is None or token in seen:
+        return None
+    seen.add(token)
+    return dict(query, **{token_key: token})
+
+
+def iter_items(func, query, items_key=None, token_key='nextToken',
+               page_key=None, prefetch=False, client=None, path=None,
+               records=False):
+    '''iter_pages()의 각 페이지에서 목록 항목을 하나씩 꺼내는 제너레이터
+
+    items_key: 목록이 들어 있는 필드(기본값: content, orders, inventories, items 순으로 찾음)
+    records: True 이면 dict 대신 func 에 맞는 __slots__ 레코드(coupang.records)를 반환
+             (Record 타입을 직접 넘길 수도 있음)
+
+    [예시]
+    for inventory in iter_items(get_rocketwarehouse_inventory,
+                                {'vendorId': 'A00012345'}, prefetch=True):
+        print(inventory['vendorItemId'])
+    '''
+
+    record = record_type(func, records)
+    for page in iter_pages(
+            func, query, token_key, page_key, prefetch, client, path):
+        items = page_items(page, items_key)
+        yield from items if record is None else map(record, items)
+
+
+async def aiter_pages(func, query, token_key='nextToken', page_key=None,
+                      prefetch=False, client=None, path=None):
+    '''iter_pages()의 asyncio 버전(prefetch 는 다음 페이지를 태스크로 미리 받음)
+
+    [예시]
+    async for page in aiter_pages(get_revenue_history, query):
+        ...
+    '''
+
+    import asyncio
+
+    if client is None:
+        client = default_client()
+
+    async def fetch(query):
+        args = (query,) if path is None else (path, query)
+        response = await client.acall(func, *args)
+        if response is None:
+            raise ValueError(f'{func.__name__}: 빈 응답')
+        return response
+
+    query = dict(query)
+    pending = None
+    try:
+        response = await fetch(query)
+        seen = set()
+        while True:
+            query = next_query(response, query, token_key, page_key, seen)
+            if query is not None and prefetch:
+                pending = asyncio.ensure_future(fetch(query))
+
+            yield response
+
+            if query is None:
+                return
+            if pending is not None:
+                response = await pending
+                pending = None
+            else:
+                response = await fetch(query)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def aiter_items(func, query, items_key=None, token_key='nextToken',
+                      page_key=None, prefetch=False, client=None, path=None,
+                      records=False):
+    '''iter_items()의 asyncio 버전'''
+
+    record = record_type(func, records)
+    async for page in aiter_pages(
+            func, query, token_key, page_key, prefetch, client, path):
+        for item in page_items(page, items_key):
+            yield item if record is None else record(item)
+
+
+##############################################################################
+# 페이지 번호 병렬 조회                                                      #
+##############################################################################
+
+
+def last_page(response, token_key='nextToken'):
+    '''목록이 비었거나 다음 페이지 토큰이 빈 값으로 온 마지막 페이지인지'''
+
+    if not page_items(response):
+        return True
+    for holder in (response, response.get('data')):
+        if isinstance(holder, dict) and token_key in holder \
+                and not holder[token_key]:
+            return True
+    return False
+
+
+def iter_pages_parallel(func, query, page_key='pageNum', base=1, workers=4,
+                        ordered=True, client=None, path=None):
+    '''페이지 번호로 넘기는 조회 API 의 페이지를 동시에 받아오는 제너레이터
+
+    첫 페이지에서 전체 페이지 수(totalPages)를 읽고 나머지를 workers 개씩 동시에 요청한다.
+    전체 페이지 수를 알 수 없는 API 는 빈 페이지(또는 빈 nextToken)가
+    나올 때까지 workers 개 만큼 앞서 요청한다.
+    동시에 받아 둔 페이지는 최대 workers 개이며, 호출 속도 제한은 클라이언트 설정을 따른다.
+
+    page_key: 페이지 번호 파라미터
+        (outbound_shipping_place: 'pageNum', get_products_by_query: 'nextToken',
+         쿠폰 목록: 'page')
+    base: 첫 페이지 번호(쿠폰 목록은 0)
+    ordered: False 이면 받은 순서대로 반환
+
+    [예시]
+    for page in iter_pages_parallel(outbound_shipping_place,
+                                    {'pageSize': 50}, workers=8):
+        ...
+    '''
+
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    if client is None:
+        client = default_client()
+
+    query = dict(query)
+    page = int(query.get(page_key) or base)
+    response = fetch_page(
+            client, func, dict(query, **{page_key: page}), path)
+    yield response
+    if last_page(response):
+        return
+    pages = total_pages(response)
+    end = None if pages is None else base + pages
+
+    def fetch(n):
+        return n, fetch_page(
+                client, func, dict(query, **{page_key: n}), path)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+    try:
+        following = page + 1
+        while True:
+            while len(pending) < workers and (end is None or following < end):
+                pending[following] = executor.submit(fetch, following)
+                following += 1
+            if not pending:
+                return
+
+            if ordered:
+                n, response = pending.pop(min(pending)).result()
+            else:
+                done, _ = wait(pending.values(), return_when=FIRST_COMPLETED)
+                n, response = done.pop().result()
+                del pending[n]
+
+            if last_page(response):
+                # 전체 페이지 수를 모르면 이후 페이지는 요청하지 않는다
+                if end is None or n + 1 < end:
+                    end = n + 1
+                for m in [m for m in pending if m >= end]:
+                    pending.pop(m).cancel()
+                if not page_items(response):
+                    continue
+            yield response
+    finally:
+        for future in pending.values():
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_items_parallel(func, query, page_key='pageNum', base=1, workers=4,
+                        ordered=True, items_key=None, client=None,
+                        path=None, records=False):
+    '''iter_pages_parallel()의 각 페이지에서 목록 항목을 하나씩 꺼내는 제너레이터
+
+    [예시]
+    for product in iter_items_parallel(get_products_by_query,
+            {'vendorId': 'A00012345', 'maxPerPage': 100},
+            page_key='nextToken', workers=8):
+        print(product['sellerProductId'])
+    '''
+
+    record = record_type(func, records)
+    for page in iter_pages_parallel(
+            func, query, page_key, base, workers, ordered, client, path):
+        items = page_items(page, items_key)
+        yield from items if record is None else map(record, items)
+
+
+##############################################################################
+# 기간 나누어 조회                                                           #
+##############################################################################
+
+
+def parse_time(value):
+    '''date, datetime, 'yyyy-mm-dd', 'yyyy-mm-ddTHH:MM' 를 datetime 으로 변환'''
+
+    import datetime
+
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value)
+    if not isinstance(value, datetime.datetime):
+        return datetime.datetime(value.year, value.month, value.day)
+    return value
+
+
+def now_kst():
+    '''현재 한국 표준시(KST, UTC+9)
+
+    쿠팡 API 의 일시는 KST 기준이므로, 서버의 시간대와 관계없이 KST 시각을
+    tzinfo 없는 datetime 으로 반환한다.
+    '''
+
+    import datetime
+
+    kst = datetime.timezone(datetime.timedelta(hours=9))
+    return datetime.datetime.now(kst).replace(tzinfo=None)
+
+
+def has_time(value):
+    '''start/end 값에 시각이 들어 있는지(분단위 조회 여부 판단용)'''
+
+    if isinstance(value, str):
+        return 'T' in value
+    return hasattr(value, 'hour')
+
+
+def date_windows(start, end, days):
+    '''start ~ end 날짜를 days 일씩(양 끝 포함, 겹치지 않게) 나눈다
+
+    [예시]
+    list(date_windows('2024-01-01', '2024-01-20', 7))
+    [('2024-01-01', '2024-01-07'), ('2024-01-08', '2024-01-14'),
+     ('2024-01-15', '2024-01-20')]
+    '''
+
+    import datetime
+
+    start, end = parse_time(start).date(), parse_time(end).date()
+    step = datetime.timedelta(days=days - 1)
+    while start <= end:
+        stop = min(start + step, end)
+        yield start.isoformat(), stop.isoformat()
+        start = stop + datetime.timedelta(days=1)
+
+
+def time_windows(start, end, step, fmt='%Y-%m-%dT%H:%M'):
+    '''start ~ end 를 step(timedelta) 간격으로 나눈다(경계 시각은 이웃 구간과 겹침)'''
+
+    start, end = parse_time(start), parse_time(end)
+    while start < end:
+        stop = min(start + step, end)
+        yield start.strftime(fmt), stop.strftime(fmt)
+        start = stop
+
+
+def iter_windows(fetch, windows, workers=4, key=None, done=None):
+    '''구간마다 fetch(window) 가 반환한 목록의 항목을 구간 순서대로 하나씩 반환
+
+    workers 개 구간을 동시에 조회하며, 메모리에는 조회 중인 구간의 항목만 보관한다.
+    key: 항목의 고유값을 구하는 함수
+        (지정하면 같은 구간 또는 바로 앞 구간에서 반환한 항목은 건너뜀)
+    done: 구간의 항목을 모두 반환한 뒤 done(window) 를 호출(진행 상황 저장용)
+    '''
+
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    windows = iter(windows)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for window in windows:
+            pending.append((window, executor.submit(fetch, window)))
+            if len(pending) >= workers:
+                break
+
+        previous = set()
+        while pending:
+            window, future = pending.popleft()
+            items = future.result()
+            following = next(windows, None)
+            if following is not None:
+                pending.append((following, executor.submit(fetch, following)))
+
+            if key is None:
+                yield from items
+            else:
+                current = set()
+                for item in items:
+                    k = key(item)
+                    if k in previous or k in current:
+                        continue
+                    current.add(k)
+                    yield item
+                previous = current
+            if done is not None:
+                done(window)
+    finally:
+        for window, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_window_items(func, windows, query, from_key='createdAtFrom',
+                      to_key='createdAtTo', key=None, sort_key=None,
+                      workers=4, client=None, path=None, **paging):
+    '''조회 기간이 제한된 API 를 구간(windows)별로 동시에 조회해 항목을 하나씩 반환
+
+    구간마다 query 에 from_key, to_key 를 채워 모든 페이지를 받고
+    (paging 은 iter_items 인자, records=True 이면 레코드를 반환),
+    sort_key 로 정렬한 뒤 iter_windows() 로 구간 순서대로 반환한다.
+    '''
+
+    if client is None:
+        client = default_client()
+
+    def fetch(window):
+        window_query = dict(query, **{from_key: window[0], to_key: window[1]})
+        items = list(iter_items(func, window_query, client=client, path=path,
+                                **paging))
+        if sort_key is not None:
+            items.sort(key=sort_key)
+        return items
+
+    return iter_windows(fetch, windows, workers, key=key)
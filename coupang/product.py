@@ -8,7 +8,7 @@ from coupang.common import coupang
 ##############################################################################
 
 
-@coupang
+@coupang(rate=10, group='seller-products.create')
 def create_product(body):
     '''상풍 등록
 
@@ -220,7 +220,7 @@ def get_inflow_status():
 ##############################################################################
 
 
-@coupang
+@coupang(group='vendor-items')
 def stop_product_sales_by_item(path):
     '''아이템별 판매 중지(or 품절)
 
@@ -237,7 +237,7 @@ def stop_product_sales_by_item(path):
     }
 
 
-@coupang
+@coupang(group='vendor-items')
 def resume_product_sales_by_item(path):
     '''아이템별 판매 재개
 
@@ -252,7 +252,7 @@ def resume_product_sales_by_item(path):
     }
 
 
-@coupang
+@coupang(group='vendor-items')
 def update_product_price_by_item(path):
     ''' 아이템별 가격 변경
     
@@ -269,7 +269,7 @@ def update_product_price_by_item(path):
     }
 
 
-@coupang
+@coupang(group='vendor-items')
 def update_product_quantity_by_item(path):
     '''아이템별 재고 수량 변경
 
@@ -304,3 +304,92 @@ def get_product_quantity_price_status(path):
                     f"/vendor-items/{path.get('vendorItemId')}/inventories"
     }
 
+
+
+##############################################################################
+# 상품 구간 스캔                                                             #
+##############################################################################
+
+
+# get_products_by_time_frame 로 한 번에 조회할 수 있는 최대 기간(분)
+TIME_FRAME_MINUTES = 10
+
+
+def scan_products_by_time_frame(start, end, vendor_id=None, workers=4,
+                                checkpoint=None, client=None):
+    '''긴 기간의 상품 목록을 생성일시 기준으로 조회하는 제너레이터
+
+    기간을 10분 구간으로 나누어 workers 개 구간을 동시에 조회하고(호출 속도 제한 적용),
+    구간 순서대로 상품을 반환한다. 구간 경계에서 중복된 상품은 한 번만 반환한다.
+
+    checkpoint: 진행 상황을 저장할 JSON 파일 경로
+        반환을 마친 구간까지 기록하며(최대 1초에 한 번, 종료 시 한 번),
+        같은 기간으로 다시 호출하면 기록된 위치부터 이어서 조회한다.
+        (중단된 구간은 처음부터 다시 조회하므로 일부 상품이 다시 반환될 수 있음)
+        끝까지 조회하면 파일을 지우므로, 다시 호출하면 처음부터 조회한다.
+
+    [주의]
+    API 가 10분을 넘는 구간을 허용하지 않으므로 빈 구간도 모두 호출한다.
+    (하루 144회, 1년 약 5만 2천회)
+
+    [예시]
+    for product in scan_products_by_time_frame(
+            '2024-01-01', '2024-04-01', checkpoint='scan.json', workers=8):
+        print(product['sellerProductId'])
+    '''
+
+    import datetime
+    import json
+    import os
+    import time
+    from coupang.common import default_client
+    from coupang.pagination import (
+            page_items, parse_time, time_windows, iter_windows)
+
+    if client is None:
+        client = default_client()
+    if vendor_id is None:
+        vendor_id = client.vendor_id
+
+    fmt = '%Y-%m-%dT%H:%M:%S'
+    start = parse_time(start).strftime(fmt)
+    end = parse_time(end).strftime(fmt)
+    state = {'vendorId': vendor_id, 'start': start, 'end': end, 'next': start}
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with open(checkpoint, encoding='utf-8') as f:
+            saved = json.load(f)
+        if all(saved.get(k) == state[k] for k in ('vendorId', 'start', 'end')):
+            state['next'] = saved['next']
+
+    def save():
+        tmp = checkpoint + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, checkpoint)
+
+    saved_at = [time.monotonic()]
+
+    def done(window):
+        state['next'] = window[1]
+        if checkpoint is not None and time.monotonic() - saved_at[0] >= 1:
+            save()
+            saved_at[0] = time.monotonic()
+
+    def fetch(window):
+        return page_items(client.call(get_products_by_time_frame, {
+                'vendorId': vendor_id,
+                'createdAtFrom': window[0], 'createdAtTo': window[1]}))
+
+    windows = time_windows(state['next'], end, datetime.timedelta(
+            minutes=TIME_FRAME_MINUTES), fmt)
+    try:
+        yield from iter_windows(
+                fetch, windows, workers, done=done,
+                key=lambda product: product.get('sellerProductId'))
+    except BaseException:
+        # 오류나 중단(GeneratorExit 포함)일 때만 이어서 조회할 위치를 남긴다
+        if checkpoint is not None:
+            save()
+        raise
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
@@ -0,0 +1,196 @@
+from sys import intern
+
+
+##############################################################################
+# __slots__ 레코드                                                           #
+##############################################################################
+
+
+class Record:
+    '''API 응답의 dict 하나를 __slots__ 속성으로 보관하는 레코드
+
+    필드마다 dict 항목 대신 슬롯 하나만 사용하고, 문자열 값은 intern 해서
+    주문마다 반복되는 상태, 상품명, 일시 등을 한 객체로 공유하므로 메모리를 크게 줄인다.
+    기존 dict 코드와 호환되도록 record['key'], record.get('key') 도 지원하며,
+    FIELDS 에 없는 키는 extra dict 에 보관한다(없으면 None).
+    응답에 없는 필드는 None 이다.
+
+    [예시]
+    sheet = OrderSheet(response['data'][0])
+    sheet.shipmentBoxId, sheet['status'], sheet.orderItems[0].vendorItemId
+    sheet.to_dict()
+    '''
+
+    __slots__ = ('extra',)
+
+    FIELDS = ()
+    NESTED = {}  # 필드 -> 값(dict 또는 dict 목록)의 레코드 타입
+
+    def __init__(self, data):
+        extra = None
+        fields = self.FIELDS
+        nested = self.NESTED
+        for key, value in data.items():
+            if key in fields:
+                if type(value) is str:
+                    value = intern(value)
+                elif key in nested:
+                    if isinstance(value, dict):
+                        value = nested[key](value)
+                    elif isinstance(value, list):
+                        value = [nested[key](v) if isinstance(v, dict) else v
+                                 for v in value]
+                object.__setattr__(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+
+    def __getattr__(self, name):
+        # 값이 채워지지 않은 슬롯
+        if name in self.FIELDS:
+            return None
+        raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def to_dict(self):
+        '''원래의 dict 형식으로 변환'''
+
+        data = {}
+        for key in self.FIELDS:
+            try:
+                value = object.__getattribute__(self, key)
+            except AttributeError:
+                continue
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [v.to_dict() if isinstance(v, Record) else v
+                         for v in value]
+            data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        key = self.FIELDS[0]
+        return f"{type(self).__name__}({key}={getattr(self, key)!r})"
+
+
+class OrderItem(Record):
+    '''발주서의 주문 상품(orderItems 항목)'''
+
+    FIELDS = __slots__ = (
+            'vendorItemId', 'vendorItemName', 'vendorItemPackageId',
+            'vendorItemPackageName', 'productId', 'sellerProductId',
+            'sellerProductName', 'sellerProductItemName',
+            'firstSellerProductItemName', 'externalVendorSkuCode',
+            'shippingCount', 'salesPrice', 'orderPrice', 'discountPrice',
+            'instantCouponDiscount', 'downloadableCouponDiscount',
+            'coupangDiscount', 'cancelCount', 'holdCountForCancel',
+            'estimatedShippingDate', 'plannedShippingDate',
+            'invoiceNumberUploadDate', 'confirmDate', 'etcInfoHeader',
+            'etcInfoValue', 'etcInfoValues', 'extraProperties',
+            'pricingBadge', 'usedProduct', 'deliveryChargeTypeName',
+            'canceled')
+
+
+class Orderer(Record):
+    '''발주서의 주문자(orderer)'''
+
+    FIELDS = __slots__ = (
+            'name', 'email', 'safeNumber', 'ordererNumber')
+
+
+class Receiver(Record):
+    '''발주서의 수취인(receiver)'''
+
+    FIELDS = __slots__ = (
+            'name', 'safeNumber', 'receiverNumber', 'addr1', 'addr2',
+            'postCode')
+
+
+class OrderSheet(Record):
+    '''발주서(get_ordersheet 의 data 항목)'''
+
+    FIELDS = __slots__ = (
+            'shipmentBoxId', 'orderId', 'orderedAt', 'paidAt', 'status',
+            'orderer', 'receiver', 'orderItems', 'shippingPrice',
+            'remotePrice', 'remoteArea', 'parcelPrintMessage',
+            'splitShipping', 'ableSplitShipping', 'overseaShippingInfoDto',
+            'deliveryCompanyName', 'invoiceNumber', 'inTrasitDateTime',
+            'deliveredDate', 'refer', 'shipmentType')
+    NESTED = {'orderer': Orderer, 'receiver': Receiver,
+              'orderItems': OrderItem}
+
+
+class ReturnRequest(Record):
+    '''반품(취소) 요청(get_return_request_by_query 의 data 항목)'''
+
+    FIELDS = __slots__ = (
+            'receiptId', 'orderId', 'paymentId', 'receiptType',
+            'receiptStatus', 'createdAt', 'modifiedAt', 'requesterName',
+            'requesterPhoneNumber', 'requesterRealPhoneNumber',
+            'requesterAddress', 'requesterAddressDetail', 'requesterZipCode',
+            'cancelReasonCategory1', 'cancelReasonCategory2', 'cancelReason',
+            'cancelCountSum', 'returnDeliveryId', 'returnDeliveryType',
+            'releaseStopStatus', 'enclosePrice', 'faultByType', 'preRefund',
+            'completeConfirmType', 'completeConfirmDate', 'reasonCode',
+            'reasonCodeText', 'returnShippingCharge', 'returnItems',
+            'returnDeliveryDtos')
+
+
+class InventorySummary(Record):
+    '''로켓창고 재고(get_rocketwarehouse_inventory 의 inventories 항목)'''
+
+    FIELDS = __slots__ = (
+            'vendorItemId', 'vendorId', 'externalSkuId',
+            'availableQuantity', 'reservedQuantity',
+            'inventoryDetails', 'salesCountMap')
+
+
+# API 함수 이름 -> 목록 항목의 레코드 타입
+RECORD_TYPES = {
+        'get_ordersheet': OrderSheet,
+        'get_ordersheet_by_orderid': OrderSheet,
+        'get_return_request_by_query': ReturnRequest,
+        'get_rocketwarehouse_inventory': InventorySummary,
+}
+
+
+def record_type(func, records):
+    '''records 인자(True 또는 Record 타입)에 해당하는 레코드 타입(사용하지 않으면 None)'''
+
+    if not records:
+        return None
+    if records is True:
+        try:
+            return RECORD_TYPES[func.__name__]
+        except KeyError:
+            raise ValueError(
+                    f'{func.__name__}: 레코드 타입이 없습니다') from None
+    return records
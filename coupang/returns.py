@@ -141,3 +141,93 @@ def create_return_exchange_invoice(path, body):
             'body': json.dumps(body).encode('utf-8')
     }
 
+
+
+##############################################################################
+# 반품 기간 조회                                                             #
+##############################################################################
+
+
+# 한 번에 조회할 구간 크기
+RETURN_WINDOW_DAYS = 7
+RETURN_TIMEFRAME_HOURS = 24
+
+
+def iter_return_requests(start, end, status=None, vendor_id=None,
+                         timeframe=None, workers=4, max_per_page=50,
+                         client=None, records=False):
+    '''기간 제한 없이 반품(취소)요청 목록을 조회하는 제너레이터
+
+    기간을 7일(분단위 조회는 24시간) 구간으로 나누어 workers 개 구간을 동시에 조회하고,
+    구간마다 nextToken 을 따라 모든 페이지를 받는다.
+    구간 경계에서 중복된 반품(receiptId)은 한 번만 반환하며, 접수일시 순서로 반환한다.
+
+    timeframe: 분단위 조회(searchType=timeFrame) 여부
+        (기본값: start 또는 end 에 시각이 있으면 분단위)
+    records: True 이면 dict 대신 ReturnRequest 레코드(coupang.records)를 반환
+
+    [예시]
+    for receipt in iter_return_requests('2024-01-01', '2024-01-31', 'UC'):
+        print(receipt['receiptId'])
+    '''
+
+    import datetime
+    from coupang.common import default_client
+    from coupang.pagination import (
+            iter_window_items, date_windows, time_windows, has_time)
+
+    if client is None:
+        client = default_client()
+    if vendor_id is None:
+        vendor_id = client.vendor_id
+    if timeframe is None:
+        timeframe = has_time(start) or has_time(end)
+
+    query = {'maxPerPage': max_per_page}
+    if status is not None:
+        query['status'] = status
+    if timeframe:
+        query['searchType'] = 'timeFrame'
+        windows = time_windows(start, end, datetime.timedelta(
+                hours=RETURN_TIMEFRAME_HOURS))
+    else:
+        windows = date_windows(start, end, RETURN_WINDOW_DAYS)
+
+    return iter_window_items(
+            get_return_request_by_query, windows, query,
+            key=lambda receipt: receipt.get('receiptId'),
+            sort_key=lambda receipt: receipt.get('createdAt') or '',
+            workers=workers, client=client, path={'vendorId': vendor_id},
+            records=records)
+
+
+def iter_return_withdraw_requests(start, end, vendor_id=None, workers=4,
+                                  size_per_page=100, client=None):
+    '''기간 제한 없이 반품철회 이력을 조회하는 제너레이터
+
+    기간을 7일 구간으로 나누어 workers 개 구간을 동시에 조회하고,
+    구간마다 pageIndex 를 넘기며 모든 페이지를 받는다.
+    중복된 이력(cancelId)은 한 번만 반환한다.
+
+    [예시]
+    for withdraw in iter_return_withdraw_requests('2024-01-01', '2024-01-31'):
+        print(withdraw['cancelId'])
+    '''
+
+    from coupang.common import default_client
+    from coupang.pagination import iter_window_items, date_windows
+
+    if client is None:
+        client = default_client()
+    if vendor_id is None:
+        vendor_id = client.vendor_id
+
+    return iter_window_items(
+            get_return_withdraw_request,
+            date_windows(start, end, RETURN_WINDOW_DAYS),
+            {'pageIndex': 1, 'sizePerPage': size_per_page},
+            from_key='dateFrom', to_key='dateTo',
+            key=lambda withdraw: withdraw.get('cancelId',
+                                              withdraw.get('receiptId')),
+            workers=workers, client=client, path={'vendorId': vendor_id},
+            page_key='pageIndex')
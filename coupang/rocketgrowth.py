@@ -192,7 +192,7 @@ def get_rocketgrowth_products_by_query(query):
     }
 
 
-@coupang
+@coupang(rate=10, group='seller-products.create')
 def create_rocketgrowth_product(body):
     '''로켓그로스 상품 생성
     
@@ -340,7 +340,7 @@ def get_rocketgrowth_product_by_id(path):
 ##############################################################################
 
 
-@coupang
+@coupang(cache_ttl=60 * 60 * 24)
 def get_rocketgrowth_category_meta(path):
     '''로켓그로스 카테고리 메타 정보 조회
     
@@ -379,7 +379,7 @@ def get_rocketgrowth_category_meta(path):
     }
 
 
-@coupang
+@coupang(cache_ttl=60 * 60 * 24)
 def get_rocketgrowth_categories():
     '''로켓그로스 카테고리 목록 조회
     
@@ -1,70 +1,92 @@
 import re
 import urllib.parse
-import scrapy
-from scrapy.crawler import CrawlerProcess
-
-
-class CoupangSpider(scrapy.Spider):
-    name = 'coupang'
-
-    def start_requests(self):
-        base_url = "https://www.coupang.com/np/search"
-        searches = getattr(self, 'searches', None)
-
-        if searches is not None:
-            if type(searches) is str:
-                searches = re.sub('\'|\"', '', searches)
-                search_list = searches.split(',')
-            elif type(searches) is list:
-                search_list = searches
-
-            for search in search_list:
-                query = {
-                        'q': search.strip(),
-                        'isPriceRange': False,
-                        'page': 1,
-                        'filterSetByUser': True,
-                        'channel': 'user',
-                        'rating': 0,
-                        'sorter': 'scoreDesc',
-                        'listSize': 72
-                }
-                url = base_url + "?" + urllib.parse.urlencode(query)
-                yield scrapy.Request(url=url, callback=self.parse)
-
-    def parse(self, response):
-        result = dict()
-
-        search_result = response.css('div.search-result > em')
-
-        search_keyword = search_result.css('::text').get()
-        if search_keyword and search_keyword.strip():
-            search_keyword = re.sub('\'|\"', '', search_keyword)
-            result['search_word'] = search_keyword.strip()
-
-        search_count = search_result.css('strong::text').get()
-        if search_count and search_count.strip():
-            search_count = re.sub('\(|\)|,', '', search_count)
-            result['count'] = search_count.strip()
-
-        result['content'] = list()
-        product_list = response.css('ul#productList > li.search-product')
-        for product in product_list:
-            result['content'].append(product.css('div.name::text').get())
-
-        word_list = ' '.join(result['content']).split(' ')
-        word_count = dict()
-        for word in word_list:
-            if word in word_count:
-                word_count[word] += 1
-            else:
-                word_count[word] = 1
-
-        # sort
-        word_count = sorted(word_count.items(), key=lambda x:x[1], reverse=True)
-
-        result['word_count'] = word_count
-        yield result
+
+
+_spider_class = None
+
+
+def spider_class():
+    '''CoupangSpider 클래스를 반환
+
+    scrapy 는 무거우므로 처음 사용할 때 불러온다.
+    '''
+
+    global _spider_class
+    if _spider_class is not None:
+        return _spider_class
+
+    import scrapy
+
+    class CoupangSpider(scrapy.Spider):
+        name = 'coupang'
+
+        def start_requests(self):
+            base_url = "https://www.coupang.com/np/search"
+            searches = getattr(self, 'searches', None)
+
+            if searches is not None:
+                if type(searches) is str:
+                    searches = re.sub('\'|\"', '', searches)
+                    search_list = searches.split(',')
+                elif type(searches) is list:
+                    search_list = searches
+
+                for search in search_list:
+                    query = {
+                            'q': search.strip(),
+                            'isPriceRange': False,
+                            'page': 1,
+                            'filterSetByUser': True,
+                            'channel': 'user',
+                            'rating': 0,
+                            'sorter': 'scoreDesc',
+                            'listSize': 72
+                    }
+                    url = base_url + "?" + urllib.parse.urlencode(query)
+                    yield scrapy.Request(url=url, callback=self.parse)
+
+        def parse(self, response):
+            result = dict()
+
+            search_result = response.css('div.search-result > em')
+
+            search_keyword = search_result.css('::text').get()
+            if search_keyword and search_keyword.strip():
+                search_keyword = re.sub('\'|\"', '', search_keyword)
+                result['search_word'] = search_keyword.strip()
+
+            search_count = search_result.css('strong::text').get()
+            if search_count and search_count.strip():
+                search_count = re.sub('\(|\)|,', '', search_count)
+                result['count'] = search_count.strip()
+
+            result['content'] = list()
+            product_list = response.css('ul#productList > li.search-product')
+            for product in product_list:
+                result['content'].append(product.css('div.name::text').get())
+
+            word_list = ' '.join(result['content']).split(' ')
+            word_count = dict()
+            for word in word_list:
+                if word in word_count:
+                    word_count[word] += 1
+                else:
+                    word_count[word] = 1
+
+            # sort
+            word_count = sorted(word_count.items(), key=lambda x:x[1], reverse=True)
+
+            result['word_count'] = word_count
+            yield result
+
+    _spider_class = CoupangSpider
+    return _spider_class
+
+
+def __getattr__(name):
+    if name == 'CoupangSpider':
+        return spider_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def search(keywords):
@@ -74,6 +96,8 @@ def search(keywords):
     '키워드,키워드' 또는 ['키워드','키워드']
     '''
 
+    from scrapy.crawler import CrawlerProcess
+
     process = CrawlerProcess(settings={
         "FEEDS": {
             "items.jsonl": {
@@ -84,6 +108,6 @@ def search(keywords):
         "LOG_ENABLED": False
     })
 
-    process.crawl(CoupangSpider, searches=keywords)
+    process.crawl(spider_class(), searches=keywords)
     process.start() # the script will block here until the crawling is finished
 
@@ -52,7 +52,7 @@ def outbound_shipping_data_template(when="create"):
         return data
 
 
-@coupang
+@coupang(invalidates=('outbound_shipping_place',))
 def register_outbound_shipping_center(body):
     '''상품 출고지 생성
 
@@ -79,7 +79,7 @@ def register_outbound_shipping_center(body):
     }
 
 
-@coupang
+@coupang(cache_ttl=60 * 10)
 def outbound_shipping_place(query):
     '''출고지 조회
 
@@ -98,7 +98,7 @@ def outbound_shipping_place(query):
     }
 
 
-@coupang
+@coupang(invalidates=('outbound_shipping_place',))
 def update_outbound_shipping_place(body):
     '''출고지 수정
 
@@ -125,7 +125,7 @@ def update_outbound_shipping_place(body):
     }
 
 
-@coupang
+@coupang(cache_ttl=60 * 10)
 def get_shipping_center_by_vendor(path, query):
     '''반품지 목록 조회'''
 
@@ -155,7 +155,7 @@ def get_shipping_by_center_code(query):
     }
 
 
-@coupang
+@coupang(invalidates=('get_shipping_center_by_vendor',))
 def update_shipping_center_by_vendor(path, body):
     '''반품지 생성'''
 
@@ -167,7 +167,7 @@ def update_shipping_center_by_vendor(path, body):
     }
 
 
-@coupang
+@coupang(invalidates=('get_shipping_center_by_vendor',))
 def update_shipping_center_by_return_center_code(path, body):
     '''반품지 수정'''
 
@@ -0,0 +1,176 @@
+from array import array
+from coupang.common import default_client
+
+
+##############################################################################
+# 재고/가격 스냅샷                                                           #
+##############################################################################
+
+
+# 값을 알 수 없는 재고/가격
+UNKNOWN = -1
+
+
+class Snapshot:
+    '''옵션ID(vendorItemId)별 재고, 가격, 판매상태를 열(column) 단위로 보관하는 표
+
+    옵션ID, 재고, 가격은 array('q'), 판매상태는 비트맵(bytearray)에 저장하고,
+    옵션ID -> 행 번호는 dict 로 찾는다.
+    항목마다 dict 를 만들지 않으므로 10만 개 옵션도 수 MB 로 보관할 수 있다.
+
+    [예시]
+    snapshot = Snapshot.build(vendor_item_ids, workers=16)
+    snapshot.get(3000000000)
+    {'amountInStock': 100, 'salePrice': 5700, 'onSale': True}
+
+    for vendor_item_id, before, after in yesterday.diff(snapshot):
+        print(vendor_item_id, before, after)
+    '''
+
+    def __init__(self):
+        self.ids = array('q')
+        self.stock = array('q')
+        self.price = array('q')
+        self.on_sale = bytearray()
+        self.index = {}
+        self.failed = []  # 조회에 실패한 옵션ID
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, vendor_item_id):
+        return int(vendor_item_id) in self.index
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    @classmethod
+    def build(cls, vendor_item_ids, workers=8, client=None):
+        '''get_product_quantity_price_status 를 workers 개씩 동시에 호출해 스냅샷 생성
+
+        옵션ID 는 int 로 바꿔서 보관하며('3000000000' 도 가능),
+        조회에 실패한 옵션ID 는 failed 에 기록한다.
+        '''
+
+        from coupang.product import get_product_quantity_price_status
+        from coupang.pagination import iter_windows
+
+        if client is None:
+            client = default_client()
+
+        def fetch(vendor_item_id):
+            try:
+                response = client.call(get_product_quantity_price_status,
+                                       {'vendorItemId': vendor_item_id})
+            except Exception:
+                return [(vendor_item_id, None)]
+            return [(vendor_item_id, response.get('data') or {})]
+
+        snapshot = cls()
+        # 잘못된 옵션ID 는 호출하기 전에 바로 예외가 나도록 먼저 int 로 변환
+        for vendor_item_id, state in iter_windows(
+                fetch, map(int, vendor_item_ids), workers):
+            if state is None:
+                snapshot.failed.append(vendor_item_id)
+            else:
+                snapshot.add(vendor_item_id, state)
+        return snapshot
+
+    def add(self, vendor_item_id, state):
+        '''행 추가(이미 있는 옵션ID 이면 값을 바꿈)
+
+        state: get_product_quantity_price_status 의 data 형식
+        '''
+
+        vendor_item_id = int(vendor_item_id)
+        stock = state.get('amountInStock')
+        price = state.get('salePrice')
+        # 열을 바꾸기 전에 변환해서, 잘못된 값이면 표를 건드리지 않고 예외가 나게 한다
+        stock = UNKNOWN if stock is None else int(stock)
+        price = UNKNOWN if price is None else int(price)
+        on_sale = bool(state.get('onSale'))
+
+        row = self.index.get(vendor_item_id)
+        if row is None:
+            row = len(self.ids)
+            self.ids.append(vendor_item_id)
+            self.stock.append(stock)
+            self.price.append(price)
+            if row % 8 == 0:
+                self.on_sale.append(0)
+            self.index[vendor_item_id] = row
+        else:
+            self.stock[row] = stock
+            self.price[row] = price
+
+        if on_sale:
+            self.on_sale[row >> 3] |= 1 << (row & 7)
+        else:
+            self.on_sale[row >> 3] &= ~(1 << (row & 7)) & 0xff
+
+    def row(self, row):
+        '''행 번호의 (재고, 가격, 판매상태)'''
+
+        return (self.stock[row], self.price[row],
+                bool(self.on_sale[row >> 3] >> (row & 7) & 1))
+
+    def get(self, vendor_item_id):
+        '''옵션ID 의 상태(dict), 없으면 None'''
+
+        row = self.index.get(int(vendor_item_id))
+        if row is None:
+            return None
+        stock, price, on_sale = self.row(row)
+        return {'amountInStock': None if stock == UNKNOWN else stock,
+                'salePrice': None if price == UNKNOWN else price,
+                'onSale': on_sale}
+
+    def states(self):
+        '''(옵션ID, 상태 dict) 를 하나씩 반환(ItemStateCache.seed_all 에 사용)'''
+
+        for vendor_item_id in self.ids:
+            yield vendor_item_id, self.get(vendor_item_id)
+
+    def diff(self, other):
+        '''other 와 비교해 바뀐 옵션을 (옵션ID, 이전 상태, 이후 상태)로 하나씩 반환
+
+        self 가 이전, other 가 이후 스냅샷이다.
+        한쪽에만 있는 옵션은 다른 쪽 상태가 None 이다.
+        '''
+
+        if self.ids == other.ids:
+            # 같은 순서로 만든 스냅샷은 열끼리 바로 비교
+            for row in sorted(self.changed_rows(other)):
+                vendor_item_id = self.ids[row]
+                yield (vendor_item_id, self.get(vendor_item_id),
+                       other.get(vendor_item_id))
+            return
+
+        for row, vendor_item_id in enumerate(self.ids):
+            other_row = other.index.get(vendor_item_id)
+            if other_row is None:
+                yield vendor_item_id, self.get(vendor_item_id), None
+            elif self.row(row) != other.row(other_row):
+                yield (vendor_item_id, self.get(vendor_item_id),
+                       other.get(vendor_item_id))
+        for vendor_item_id in other.ids:
+            if vendor_item_id not in self.index:
+                yield vendor_item_id, None, other.get(vendor_item_id)
+
+    def changed_rows(self, other):
+        '''옵션ID 순서가 같은 스냅샷과 값이 다른 행 번호들'''
+
+        rows = set()
+        for mine, theirs in ((self.stock, other.stock),
+                             (self.price, other.price)):
+            if mine != theirs:
+                rows.update(row for row, (a, b) in enumerate(zip(mine, theirs))
+                            if a != b)
+        if self.on_sale != other.on_sale:
+            for i, (a, b) in enumerate(zip(self.on_sale, other.on_sale)):
+                bits = a ^ b
+                while bits:
+                    bit = bits & -bits
+                    rows.add(i * 8 + bit.bit_length() - 1)
+                    bits ^= bit
+        return rows
@@ -0,0 +1,438 @@
+import io
+import time
+import json
+import ssl
+import asyncio
+import weakref
+import threading
+import http.client
+import urllib.parse
+import urllib.request
+
+
+##############################################################################
+# 전송 함수                                                                  #
+##############################################################################
+
+
+def request(method, url, authorization, body=None, pool=None):
+    parsed = urllib.parse.urlsplit(url)
+    target = parsed.path + ("?" + parsed.query if parsed.query else "")
+    headers = {
+            "Content-type": "application/json;charset=UTF-8",
+            "Authorization": authorization,
+            "X-EXTENDED-TIMEOUT": "90000" # 타임아웃 시간늘리기
+    }
+
+    try:
+        if pool is None:
+            pool = get_pool(parsed.hostname, parsed.port or 443)
+        status, reason, resp_headers, data = pool.urlopen(
+                method, target, headers, body)
+        if status >= 400:
+            raise urllib.request.HTTPError(
+                    url, status, reason, resp_headers, io.BytesIO(data))
+
+    except urllib.request.HTTPError as e:
+        print("=" * 80)
+        print(f"[HTTP Error] {e.code} - {e.reason}")
+        print(f"URL: {e.url}")
+        print(f"Headers: {dict(e.headers)}")
+        try:
+            error_body = e.read().decode('utf-8')
+            print(f"Response Body:\n{error_body}")
+        except Exception:
+            print("Response Body: (읽기 실패)")
+        print("=" * 80)
+        raise e
+    except (OSError, http.client.HTTPException) as e:
+        e = urllib.request.URLError(e)
+        print("=" * 80)
+        print(f"[URL Error] {type(e).__name__}")
+        print(f"Reason: {e.reason}")
+        if hasattr(e, 'errno'):
+            print(f"Error Code: {e.errno}")
+        print(f"URL: {url}")
+        print("=" * 80)
+        raise e
+    else:
+        # 200
+        charset = resp_headers.get_content_charset() or 'utf-8'
+        response = json.loads(data.decode(charset))
+        return response
+
+
+async def request_async(method, url, authorization, body=None, pool=None):
+    '''request()의 asyncio 버전
+
+    pool: 사용할 AsyncConnectionPool(기본값: 현재 이벤트 루프의 호스트별 공유 풀)
+    '''
+
+    parsed = urllib.parse.urlsplit(url)
+    target = parsed.path + ("?" + parsed.query if parsed.query else "")
+    headers = {
+            "Content-type": "application/json;charset=UTF-8",
+            "Authorization": authorization,
+            "X-EXTENDED-TIMEOUT": "90000" # 타임아웃 시간늘리기
+    }
+
+    try:
+        if pool is None:
+            pool = get_async_pool(parsed.hostname, parsed.port or 443)
+        status, reason, resp_headers, data = await pool.urlopen(
+                method, target, headers, body)
+        if status >= 400:
+            raise urllib.request.HTTPError(
+                    url, status, reason, resp_headers, io.BytesIO(data))
+
+    except urllib.request.HTTPError as e:
+        print("=" * 80)
+        print(f"[HTTP Error] {e.code} - {e.reason}")
+        print(f"URL: {e.url}")
+        print(f"Headers: {dict(e.headers)}")
+        try:
+            error_body = e.read().decode('utf-8')
+            print(f"Response Body:\n{error_body}")
+        except Exception:
+            print("Response Body: (읽기 실패)")
+        print("=" * 80)
+        raise e
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+            http.client.HTTPException, ValueError) as e:
+        e = urllib.request.URLError(e)
+        print("=" * 80)
+        print(f"[URL Error] {type(e).__name__}")
+        print(f"Reason: {e.reason}")
+        print(f"URL: {url}")
+        print("=" * 80)
+        raise e
+    else:
+        # 200
+        charset = resp_headers.get_content_charset() or 'utf-8'
+        response = json.loads(data.decode(charset))
+        return response
+
+
+##############################################################################
+# 커넥션 풀                                                                  #
+##############################################################################
+
+
+POOL_SIZE = 10       # 호스트별로 보관할 유휴 커넥션의 최대 개수
+IDLE_TIMEOUT = 60    # 이 시간(초) 이상 사용되지 않은 커넥션은 폐기
+SOCKET_TIMEOUT = 100 # X-EXTENDED-TIMEOUT(90초)보다 조금 길게
+ASYNC_LIMIT = 100    # 이벤트 루프별 동시 요청 수 제한(asyncio)
+
+_ssl_context = None
+_pools = {}
+_async_pools = weakref.WeakKeyDictionary()  # 이벤트 루프 -> {(host, port): 풀}
+_pools_lock = threading.Lock()
+
+
+def ssl_context():
+    '''프로세스 전체에서 공유하는 SSL 컨텍스트
+
+    요청마다 새로 만들지 않도록 최초 1회만 생성한다.
+    (기존과 동일하게 인증서 검증은 생략)
+    '''
+
+    global _ssl_context
+    if _ssl_context is None:
+        #skipping for ssl cert.
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+        _ssl_context = ctx
+    return _ssl_context
+
+
+class ConnectionPool:
+    '''keep-alive HTTPS 커넥션 풀
+
+    사용이 끝난 커넥션을 반납받아 다음 요청에서 재사용한다.
+    커넥션은 한 번에 하나의 스레드만 사용하며(checkout/반납),
+    유휴 커넥션은 최대 size개까지 보관한다.
+
+    서버가 먼저 끊어버린(stale) 커넥션을 재사용하다 실패하면
+    새 커넥션으로 한 번 더 요청한다.
+    '''
+
+    def __init__(self, host, port=443, size=None, idle_timeout=None,
+                 timeout=None):
+        self.host = host
+        self.port = port
+        self.size = POOL_SIZE if size is None else size
+        self.idle_timeout = IDLE_TIMEOUT if idle_timeout is None \
+                else idle_timeout
+        self.timeout = SOCKET_TIMEOUT if timeout is None else timeout
+        self._idle = []  # (커넥션, 마지막 사용 시각) LIFO
+        self._lock = threading.Lock()
+
+    def _new_conn(self):
+        return http.client.HTTPSConnection(
+                self.host, self.port,
+                timeout=self.timeout,
+                context=ssl_context())
+
+    def _get_conn(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, last_used = self._idle.pop()
+                if now - last_used < self.idle_timeout:
+                    return conn, True
+                conn.close()
+        return self._new_conn(), False
+
+    def _put_conn(self, conn):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def urlopen(self, method, target, headers, body=None):
+        '''요청을 보내고 (status, reason, headers, 본문 bytes)를 반환'''
+
+        conn, reused = self._get_conn()
+        try:
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected,
+                    http.client.BadStatusLine,
+                    ConnectionResetError,
+                    BrokenPipeError):
+                if not reused:
+                    raise
+                # 유휴 상태에서 서버가 끊은 커넥션, 새로 연결해서 재시도
+                conn.close()
+                conn = self._new_conn()
+                conn.request(method, target, body=body, headers=headers)
+                resp = conn.getresponse()
+            data = resp.read()
+        except BaseException:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._put_conn(conn)
+        return resp.status, resp.reason, resp.headers, data
+
+    def clear(self):
+        '''보관 중인 유휴 커넥션을 모두 닫는다'''
+
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+
+def get_pool(host, port=443):
+    '''호스트별 커넥션 풀을 반환(없으면 생성)'''
+
+    key = (host, port)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(host, port)
+    return pool
+
+
+def configure_pool(size=None, idle_timeout=None, timeout=None, limit=None):
+    '''커넥션 풀 설정 변경
+
+    size: 호스트별 유휴 커넥션 최대 개수
+    idle_timeout: 유휴 커넥션 폐기 기준(초)
+    timeout: 소켓 타임아웃(초)
+    limit: asyncio 풀의 동시 요청 수 제한(이후 생성되는 풀부터 적용)
+
+    이미 만들어진 풀에도 바로 적용된다.
+    '''
+
+    global POOL_SIZE, IDLE_TIMEOUT, SOCKET_TIMEOUT, ASYNC_LIMIT
+    if size is not None:
+        POOL_SIZE = size
+    if idle_timeout is not None:
+        IDLE_TIMEOUT = idle_timeout
+    if timeout is not None:
+        SOCKET_TIMEOUT = timeout
+    if limit is not None:
+        ASYNC_LIMIT = limit
+
+    with _pools_lock:
+        pools = list(_pools.values())
+        for loop_pools in _async_pools.values():
+            pools.extend(loop_pools.values())
+    for pool in pools:
+        pool.size = POOL_SIZE
+        pool.idle_timeout = IDLE_TIMEOUT
+        pool.timeout = SOCKET_TIMEOUT
+
+
+class AsyncConnectionPool:
+    '''asyncio 스트림 기반 keep-alive HTTPS 커넥션 풀
+
+    ConnectionPool 과 같은 방식으로 커넥션을 재사용하며,
+    동시에 진행되는 요청 수를 limit개로 제한한다.
+    이벤트 루프마다 별도의 풀을 사용한다(get_async_pool).
+    '''
+
+    def __init__(self, host, port=443, size=None, idle_timeout=None,
+                 timeout=None, limit=None):
+        self.host = host
+        self.port = port
+        self.size = POOL_SIZE if size is None else size
+        self.idle_timeout = IDLE_TIMEOUT if idle_timeout is None \
+                else idle_timeout
+        self.timeout = SOCKET_TIMEOUT if timeout is None else timeout
+        self.limit = ASYNC_LIMIT if limit is None else limit
+        self._idle = []  # ((reader, writer), 마지막 사용 시각) LIFO
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    async def _new_conn(self):
+        return await asyncio.wait_for(
+                asyncio.open_connection(
+                    self.host, self.port,
+                    ssl=ssl_context(),
+                    server_hostname=self.host),
+                self.timeout)
+
+    async def _get_conn(self):
+        now = time.monotonic()
+        while self._idle:
+            conn, last_used = self._idle.pop()
+            if now - last_used < self.idle_timeout \
+                    and not conn[0].at_eof():
+                return conn, True
+            self._close(conn)
+        return await self._new_conn(), False
+
+    def _put_conn(self, conn):
+        if len(self._idle) < self.size:
+            self._idle.append((conn, time.monotonic()))
+        else:
+            self._close(conn)
+
+    @staticmethod
+    def _close(conn):
+        conn[1].close()
+
+    async def _send(self, conn, method, target, headers, body):
+        reader, writer = conn
+        host = self.host if self.port == 443 else f"{self.host}:{self.port}"
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}",
+                 "Accept-Encoding: identity"]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('utf-8'))
+        if body:
+            writer.write(body)
+        await writer.drain()
+
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, _, rest = head.partition(b"\r\n")
+        version, status, reason = \
+                (status_line.decode('latin-1').split(' ', 2) + [''])[:3]
+        status = int(status)
+        resp_headers = http.client.parse_headers(io.BytesIO(rest))
+
+        keep_alive = version == 'HTTP/1.1' and \
+                resp_headers.get('Connection', '').lower() != 'close'
+        if status in (204, 304) or 100 <= status < 200:
+            data = b''
+        elif resp_headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size_line = await reader.readuntil(b"\r\n")
+                size = int(size_line.split(b";", 1)[0], 16)
+                if size == 0:
+                    # trailer
+                    while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b''.join(chunks)
+        elif resp_headers.get('Content-Length') is not None:
+            data = await reader.readexactly(int(resp_headers['Content-Length']))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return status, reason, resp_headers, data, keep_alive
+
+    async def urlopen(self, method, target, headers, body=None):
+        '''요청을 보내고 (status, reason, headers, 본문 bytes)를 반환'''
+
+        async with self._semaphore:
+            conn, reused = await self._get_conn()
+            try:
+                try:
+                    result = await asyncio.wait_for(
+                            self._send(conn, method, target, headers, body),
+                            self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # 유휴 상태에서 서버가 끊은 커넥션, 새로 연결해서 재시도
+                    self._close(conn)
+                    conn = await self._new_conn()
+                    result = await asyncio.wait_for(
+                            self._send(conn, method, target, headers, body),
+                            self.timeout)
+            except BaseException:
+                self._close(conn)
+                raise
+
+            status, reason, resp_headers, data, keep_alive = result
+            if keep_alive:
+                self._put_conn(conn)
+            else:
+                self._close(conn)
+            return status, reason, resp_headers, data
+
+    async def clear(self):
+        '''보관 중인 유휴 커넥션을 모두 닫는다'''
+
+        idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+        for conn, _ in idle:
+            try:
+                await asyncio.wait_for(conn[1].wait_closed(), 1)
+            except Exception:
+                pass
+
+
+def get_async_pool(host, port=443):
+    '''현재 이벤트 루프의 호스트별 asyncio 커넥션 풀을 반환(없으면 생성)'''
+
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        loop_pools = _async_pools.get(loop)
+        if loop_pools is None:
+            loop_pools = _async_pools[loop] = {}
+    key = (host, port)
+    pool = loop_pools.get(key)
+    if pool is None:
+        pool = loop_pools[key] = AsyncConnectionPool(host, port)
+    return pool
+
+
+async def close_async_pools():
+    '''현재 이벤트 루프의 asyncio 커넥션 풀을 모두 닫는다
+
+    asyncio.run() 이 끝나기 전에 호출하면
+    닫히지 않은 소켓에 대한 경고를 피할 수 있다.
+    '''
+
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        loop_pools = _async_pools.pop(loop, {})
+    for pool in loop_pools.values():
+        await pool.clear()
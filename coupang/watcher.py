@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import threading
+import datetime
+
+
+##############################################################################
+# 주문 알림 대상(sink)                                                       #
+##############################################################################
+
+
+class QueueSink:
+    '''새로 생기거나 바뀐 발주서를 queue.Queue 에 (sheet, previous) 로 넣는다'''
+
+    def __init__(self, queue=None):
+        if queue is None:
+            import queue as _queue
+            queue = _queue.Queue()
+        self.queue = queue
+
+    def __call__(self, sheet, previous):
+        self.queue.put((sheet, previous))
+
+
+class NdjsonSink:
+    '''발주서를 날짜별 NDJSON 파일(orders-YYYYMMDD.ndjson)에 한 줄씩 추가한다'''
+
+    def __init__(self, directory='.', prefix='orders'):
+        self.directory = directory
+        self.prefix = prefix
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, sheet, previous):
+        name = f"{self.prefix}-{datetime.date.today():%Y%m%d}.ndjson"
+        line = json.dumps({'sheet': sheet, 'new': previous is None},
+                          ensure_ascii=False)
+        with open(os.path.join(self.directory, name), 'a',
+                  encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+##############################################################################
+# 신규 주문 감시                                                             #
+##############################################################################
+
+
+def lock_file(path):
+    '''다른 프로세스가 같은 파일을 잠그고 있으면 RuntimeError'''
+
+    f = open(path, 'a+')
+    try:
+        try:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        raise RuntimeError(f'이미 실행 중인 감시 프로세스가 있습니다: {path}')
+    return f
+
+
+class OrderWatcher:
+    '''신규/변경 발주서 감시
+
+    OrderSync(분단위 timeFrame 증분 조회)를 반복 호출하며,
+    새로 생기거나 바뀐 발주서를 sinks 에 sink(sheet, previous) 로 전달한다.
+    sink 는 함수, QueueSink, NdjsonSink 등 (sheet, previous) 를 받는 callable 이다.
+
+    호출 간격은 변경이 있으면 절반으로 줄고(min_interval 까지),
+    변경이 없거나 오류가 나면 1.5배씩 늘어난다(max_interval 까지).
+    조회는 한 번에 하나씩만 하며, 잠금 파일로 판매자 ID 당 한 프로세스만 실행된다.
+
+    [예시]
+    watcher = OrderWatcher([print, NdjsonSink('orders')], path='orders.db')
+    watcher.run()  # watcher.stop() 으로 종료
+    '''
+
+    def __init__(self, sinks=(), path='orders.db', statuses=None,
+                 vendor_id=None, client=None, min_interval=5,
+                 max_interval=300, **sync_options):
+        from coupang.common import default_client
+
+        self.client = default_client() if client is None else client
+        self.vendor_id = self.client.vendor_id if vendor_id is None \
+                else vendor_id
+        self.sinks = list(sinks)
+        self.path = path
+        self.statuses = statuses
+        self.sync_options = sync_options
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.sync = None
+        self._stop = threading.Event()
+
+    def publish(self, sheet, previous):
+        for sink in self.sinks:
+            sink(sheet, previous)
+
+    def poll(self, now=None):
+        '''한 번 조회하고, 결과에 따라 다음 호출 간격을 조정한 뒤 바뀐 발주서 목록을 반환'''
+
+        if self.sync is None:
+            # SQLite 연결은 만든 스레드에서만 사용할 수 있으므로 처음 조회할 때 만든다
+            from coupang.ordersync import OrderSync, ORDER_STATUSES
+            self.sync = OrderSync(
+                    self.path, self.statuses or ORDER_STATUSES,
+                    vendor_id=self.vendor_id, client=self.client,
+                    on_change=self.publish, **self.sync_options)
+
+        try:
+            changed = self.sync.sync(now)
+        except Exception:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+            raise
+        if changed:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+        return changed
+
+    def run(self):
+        '''stop() 이 호출될 때까지 조회를 반복'''
+
+        lock = lock_file(f"{self.path}.{self.vendor_id}.lock")
+        try:
+            self._stop.clear()
+            while not self._stop.is_set():
+                started = time.monotonic()
+                try:
+                    self.poll()
+                except Exception as e:
+                    print(f"[OrderWatcher] {type(e).__name__}: {e}")
+                elapsed = time.monotonic() - started
+                self._stop.wait(max(0, self.interval - elapsed))
+        finally:
+            if self.sync is not None:
+                self.sync.close()
+                self.sync = None
+            lock.close()
+
+    def stop(self):
+        self._stop.set()
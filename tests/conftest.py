@@ -0,0 +1,70 @@
+import email.message
+import urllib.error
+import urllib.parse
+
+import pytest
+
+from coupang import common, transport
+
+
+class FakeTransport:
+    '''transport.request 대신 handler(method, url, body) 의 결과를 돌려주는 전송 계층
+
+    handler 가 예외 객체를 반환하면 그 예외를 올린다.
+    '''
+
+    def __init__(self):
+        self.requests = []  # (method, url, authorization, body)
+        self.handler = lambda method, url, body: {'code': 200, 'data': []}
+
+    def request(self, method, url, authorization, body=None, pool=None):
+        self.requests.append((method, url, authorization, body))
+        result = self.handler(method, url, body)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def request_async(self, method, url, authorization, body=None,
+                            pool=None):
+        return self.request(method, url, authorization, body, pool)
+
+    def queries(self):
+        '''보낸 요청들의 쿼리(dict) 목록'''
+
+        return [query_of(url) for _, url, _, _ in self.requests]
+
+
+def query_of(url):
+    '''URL 의 쿼리를 dict 로'''
+
+    return dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+
+
+def http_error(code, retry_after=None):
+    headers = email.message.Message()
+    if retry_after is not None:
+        headers['Retry-After'] = str(retry_after)
+    return urllib.error.HTTPError('https://test', code, 'error', headers, None)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeTransport()
+    monkeypatch.setattr(transport, 'request', fake.request)
+    monkeypatch.setattr(transport, 'request_async', fake.request_async)
+    return fake
+
+
+@pytest.fixture
+def client(fake):
+    return common.CoupangClient(
+            'access', 'secret', 'A00000001',
+            retry_policy=common.RetryPolicy(base_delay=0))
+
+
+@pytest.fixture
+def default_client(monkeypatch, client):
+    '''모듈 함수가 사용하는 기본 클라이언트를 client 로 바꾼다'''
+
+    monkeypatch.setattr(common, '_default_client', client)
+    return client
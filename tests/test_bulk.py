@@ -0,0 +1,90 @@
+import json
+import time
+
+from coupang import common
+from coupang.bulk import BulkUpdate, ITEM_GROUP, acknowledge_orders
+from coupang.common import CoupangClient, RetryPolicy
+from conftest import http_error
+
+
+def test_bulk_update_keeps_order_per_item(client, fake):
+    # CSV 에서 읽은 옵션ID 는 문자열이라 같은 옵션이 3000 과 '3000' 으로 섞여 들어온다
+    changes = [(3000 + n % 5 if n % 2 else str(3000 + n % 5), 'quantity', n)
+               for n in range(50)]
+
+    def handler(method, url, body):
+        time.sleep(0.001)
+        return {'code': 200}
+    fake.handler = handler
+
+    results = list(BulkUpdate(workers=4, client=client).run(changes))
+
+    assert len(results) == 50 and all(r.ok for r in results)
+    for item in range(3000, 3005):
+        sent = [url for _, url, _, _ in fake.requests
+                if f'/vendor-items/{item}/' in url]
+        assert [int(u.rsplit('/', 1)[1]) for u in sent] == \
+                [n for n in range(50) if 3000 + n % 5 == item]
+
+
+def test_bulk_update_reports_invalid_ids(client, fake):
+    results = list(BulkUpdate(client=client).run([('x', 'quantity', 1),
+                                                  (1, 'quantity', 1)]))
+
+    failed = [r for r in results if not r.ok]
+    assert [r.vendor_item_id for r in failed] == ['x']
+    assert isinstance(failed[0].error, ValueError)
+    assert len(fake.requests) == 1
+
+
+def test_bulk_update_rate_is_scoped_to_run(client, fake):
+    client.set_rate_limit(ITEM_GROUP, 7)
+    previous = client.limiters[ITEM_GROUP]
+
+    run = BulkUpdate(rate=1000, client=client, queue_size=2).run(
+            (i, 'quantity', 1) for i in range(20))
+    next(run)
+    assert client.limiters[ITEM_GROUP].rate == 1000
+    run.close()
+
+    assert client.limiters[ITEM_GROUP] is previous
+    assert previous.rate == 7
+
+
+def test_acknowledge_orders_does_not_retry_client_errors(client, fake):
+    fake.handler = lambda method, url, body: http_error(400)
+
+    report = acknowledge_orders([1, 2, 3], retries=2, client=client)
+
+    assert len(fake.requests) == 1
+    assert sorted(report['failed']) == [1, 2, 3]
+
+
+def test_acknowledge_orders_matches_string_ids(client, fake):
+    def handler(method, url, body):
+        ids = json.loads(body)['shipmentBoxIds']
+        return {'code': 200, 'data': {'responseCode': 1, 'responseList': [
+                {'shipmentBoxId': int(i), 'succeed': int(i) != 2,
+                 'retryRequired': False, 'resultMessage': 'fail'}
+                for i in ids]}}
+    fake.handler = handler
+
+    report = acknowledge_orders(['1', '2', '3'], client=client)
+
+    assert report == {'succeeded': ['1', '3'], 'failed': {'2': 'fail'}}
+
+
+def test_acknowledge_orders_uses_global_retry_policy(monkeypatch, fake):
+    class RetryBadRequest(RetryPolicy):
+        def is_retryable(self, e):
+            return getattr(e, 'code', None) == 400
+
+    monkeypatch.setattr(common, 'RETRY_POLICY',
+                        RetryBadRequest(max_retries=0))
+    fake.handler = lambda method, url, body: http_error(400)
+
+    report = acknowledge_orders([1], retries=2,
+                                client=CoupangClient('a', 's', 'V'))
+
+    assert len(fake.requests) == 3
+    assert list(report['failed']) == [1]
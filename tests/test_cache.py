@@ -0,0 +1,55 @@
+import time
+
+from coupang.common import ResponseCache, DiskStore, MISSING
+
+
+def test_lru_eviction():
+    cache = ResponseCache(maxsize=2)
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 60)
+    cache.get('a')  # a 를 최근 사용으로
+    cache.set('c', 3, 60)
+
+    assert cache.get('b') is MISSING
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+
+def test_ttl_expiry():
+    cache = ResponseCache()
+    cache.set('a', 1, 0.01)
+    cache.set('b', 2, float('inf'))
+    time.sleep(0.02)
+
+    assert cache.get('a') is MISSING
+    assert cache.get('b') == 2
+    assert cache.stats()['hits'] == 1
+
+
+def test_invalidate_by_key_and_tag():
+    cache = ResponseCache()
+    cache.set('a', 1, 60, tag='x')
+    cache.set('b', 2, 60, tag='x')
+    cache.set('c', 3, 60, tag='y')
+
+    cache.invalidate(key='c')
+    assert cache.get('c') is MISSING
+    cache.invalidate(tag='x')
+    assert len(cache) == 0
+
+
+def test_disk_store_survives_restart(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    key = ('GET', '/v2/things/1', None)
+    cache = ResponseCache(store=DiskStore(path))
+    cache.set(key, {'code': 200, 'data': '한글'}, float('inf'), 'get_thing')
+    cache.set(('GET', '/short', None), {'code': 200}, 0.01)
+    cache.store.close()
+
+    time.sleep(0.02)
+    cache = ResponseCache(store=DiskStore(path))
+    assert cache.get(key) == {'code': 200, 'data': '한글'}
+    assert cache.get(('GET', '/short', None)) is MISSING
+
+    cache.invalidate(tag='get_thing')
+    cache = ResponseCache(store=DiskStore(path))
+    assert cache.get(key) is MISSING
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import urllib.error
+import urllib.parse
+
+import pytest
+
+from coupang.common import coupang, Request, CoupangClient, RetryPolicy
+from conftest import http_error
+
+
+@coupang
+def get_thing(path, query):
+    return {
+        'method': "GET",
+        'path': f"/v2/things/{path['id']}",
+        'query': urllib.parse.urlencode(query),
+    }
+
+
+@coupang(cache_ttl=60)
+def get_cached(path):
+    return {'method': "GET", 'path': f"/v2/cached/{path['id']}"}
+
+
+@coupang(invalidates=('get_cached',))
+def update_cached(path, body):
+    return {
+        'method': "PUT",
+        'path': f"/v2/cached/{path['id']}",
+        'body': json.dumps(body).encode('utf-8'),
+    }
+
+
+def test_request_from_spec_drops_unused_parts():
+    put = Request.from_spec({'method': 'PUT', 'path': '/p', 'query': 'a=1',
+                             'body': b'{}'})
+    assert (put.query, put.body) == ('a=1', None)
+    post = Request.from_spec({'method': 'POST', 'path': '/p', 'query': 'a=1',
+                              'body': b'{}'})
+    assert (post.query, post.body) == (None, b'{}')
+    delete = Request.from_spec({'method': 'DELETE', 'path': '/p',
+                                'query': 'a=1', 'body': b'{}'})
+    assert (delete.query, delete.body) == (None, None)
+
+
+def test_call_builds_url_and_signs(client, fake):
+    fake.handler = lambda method, url, body: {'code': 200, 'data': [1]}
+
+    response = client.call(get_thing, {'id': 1}, {'a': 'b'})
+
+    assert response == {'code': 200, 'data': [1]}
+    method, url, authorization, body = fake.requests[0]
+    assert method == 'GET'
+    assert url == 'https://api-gateway.coupang.com/v2/things/1?a=b'
+    assert authorization.startswith(
+            'CEA algorithm=HmacSHA256, access-key=access, signed-date=')
+    assert body is None
+
+
+def test_call_retries_retryable_errors(client, fake):
+    errors = [http_error(500), http_error(429, retry_after=0)]
+    fake.handler = lambda method, url, body: \
+            errors.pop(0) if errors else {'code': 200}
+
+    assert client.call(get_thing, {'id': 1}, {}) == {'code': 200}
+    assert len(fake.requests) == 3
+    # 재시도할 때마다 새로 서명
+    assert all(r[2] for r in fake.requests)
+
+
+def test_call_does_not_retry_client_errors(client, fake):
+    fake.handler = lambda method, url, body: http_error(400)
+
+    with pytest.raises(urllib.error.HTTPError):
+        client.call(get_thing, {'id': 1}, {})
+    assert len(fake.requests) == 1
+
+
+def test_call_gives_up_after_max_retries(fake):
+    client = CoupangClient('a', 's', 'V', retry_policy=RetryPolicy(
+            max_retries=2, base_delay=0))
+    fake.handler = lambda method, url, body: http_error(503)
+
+    with pytest.raises(urllib.error.HTTPError):
+        client.call(get_thing, {'id': 1}, {})
+    assert len(fake.requests) == 3
+
+
+def test_module_function_returns_none_on_error(default_client, fake):
+    fake.handler = lambda method, url, body: http_error(400)
+
+    assert get_thing({'id': 1}, {}) is None
+
+
+def test_bound_function_raise_errors(fake):
+    fake.handler = lambda method, url, body: http_error(404)
+    quiet = CoupangClient('a', 's', 'V')
+    strict = CoupangClient('a', 's', 'V', raise_errors=True)
+
+    assert quiet.bind(get_thing)({'id': 1}, {}) is None
+    with pytest.raises(urllib.error.HTTPError):
+        strict.bind(get_thing)({'id': 1}, {})
+
+
+def test_acall(client, fake):
+    fake.handler = lambda method, url, body: {'code': 200, 'url': url}
+
+    response = asyncio.run(client.acall(get_thing, {'id': 2}, {'a': 'b'}))
+
+    assert response['url'].endswith('/v2/things/2?a=b')
+
+
+def test_cache_and_invalidation(client, fake):
+    client.enable_cache()
+    fake.handler = lambda method, url, body: {'code': 200,
+                                              'n': len(fake.requests)}
+
+    first = client.call(get_cached, {'id': 1})
+    assert client.call(get_cached, {'id': 1}) is first
+    assert len(fake.requests) == 1
+
+    client.call(update_cached, {'id': 1}, {'name': 'x'})
+    assert client.call(get_cached, {'id': 1}) != first
+    assert len(fake.requests) == 3
+
+
+def test_endpoints_bind_client_to_helpers(client, fake):
+    other = CoupangClient('other', 'secret', 'V2')
+    fake.handler = lambda method, url, body: {'code': 200, 'data': [],
+                                              'nextToken': ''}
+
+    list(other.ordersheet.iter_ordersheets('ACCEPT', '2024-01-01',
+                                           '2024-01-02'))
+
+    assert '/vendors/V2/' in fake.requests[0][1]
+    assert 'access-key=other' in fake.requests[0][2]
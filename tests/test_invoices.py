@@ -0,0 +1,75 @@
+import json
+
+from coupang.invoices import InvoiceIndex, upload_invoices
+
+
+def invoice(box, number):
+    return {'shipmentBoxId': box, 'orderId': 1, 'vendorItemId': 1,
+            'deliveryCompanyCode': 'CJGLS', 'invoiceNumber': number,
+            'splitShipping': False, 'preSplitShipped': False,
+            'estimatedShippingDate': ''}
+
+
+def shipping_handler(failing=()):
+    '''failing 에 든 묶음배송번호만 실패로 응답(responseList 의 번호는 int)'''
+
+    def handler(method, url, body):
+        rows = json.loads(body)['orderSheetInvoiceApplyDtos']
+        results = []
+        for r in rows:
+            box = int(r['shipmentBoxId'])
+            results.append({'shipmentBoxId': box, 'succeed': box not in failing,
+                            'resultMessage': 'fail' if box in failing else 'OK'})
+        return {'code': 200, 'data': {'responseCode': 1,
+                                      'responseList': results}}
+    return handler
+
+
+def test_upload_invoices_matches_string_ids(client, fake, tmp_path):
+    fake.handler = shipping_handler(failing={2})
+    rows = [invoice(str(box), f'N{box}') for box in (1, 2, 3)]
+
+    with InvoiceIndex(str(tmp_path / 'invoices.db')) as index:
+        results = list(upload_invoices(rows, index, client=client))
+
+        assert [(row['shipmentBoxId'], ok) for row, ok, _ in results] == \
+                [('1', True), ('2', False), ('3', True)]
+        assert [index.used(n) for n in ('N1', 'N2', 'N3')] == \
+                [True, False, True]
+
+
+def test_upload_invoices_resends_number_after_failure(client, fake, tmp_path):
+    fake.handler = shipping_handler(failing={1})
+    rows = [invoice(1, 'N1'), invoice(2, 'N1'), invoice(3, 'N1')]
+
+    with InvoiceIndex(str(tmp_path / 'invoices.db')) as index:
+        results = list(upload_invoices(rows, index, batch_size=1, workers=1,
+                                       client=client))
+
+    # 실패한 1 의 송장번호는 2 에서 다시 보내고, 성공한 뒤에는 3 을 막는다
+    assert [(row['shipmentBoxId'], ok, message)
+            for row, ok, message in results] == [
+            (1, False, 'fail'), (2, True, 'OK'),
+            (3, False, '이번 업로드에서 이미 보낸 송장번호')]
+    assert len(fake.requests) == 2
+
+
+def test_upload_invoices_rejects_used_numbers(client, fake, tmp_path):
+    with InvoiceIndex(str(tmp_path / 'invoices.db')) as index:
+        index.add('N1', 1)
+        results = list(upload_invoices([invoice(2, 'N1')], index,
+                                       client=client))
+
+    assert [(ok, message) for _, ok, message in results] == \
+            [(False, '6개월 이내에 사용한 송장번호')]
+    assert fake.requests == []
+
+
+def test_invoice_index_add_many(tmp_path):
+    with InvoiceIndex(str(tmp_path / 'invoices.db')) as index:
+        index.add_many([('N1', 1), (2, 2)], now=1000)
+        index.add_many([])
+
+        assert len(index) == 2
+        assert index.used('N1', now=1000) and index.used('2', now=1000)
+        assert not index.used('N1', now=1000 + index.period)
@@ -0,0 +1,26 @@
+from coupang.itemcache import ItemStateCache
+from conftest import http_error
+
+
+def test_item_cache_normalises_ids_and_values(client, fake):
+    cache = ItemStateCache(client)
+    cache.seed(1, {'salePrice': 15000, 'amountInStock': '3'})
+
+    assert cache.apply(1, 'price', '15000') is False
+    assert cache.apply('1', 'quantity', 3) is False
+    assert cache.apply(1, 'price', '16000') is True
+    assert cache.apply(1, 'price', 16000) is False
+    assert cache.get('1') == {'salePrice': 16000, 'amountInStock': 3}
+    assert len(fake.requests) == 1
+
+
+def test_item_cache_forgets_state_after_failure(client, fake):
+    cache = ItemStateCache(client)
+    cache.seed(1, {'salePrice': 100})
+    fake.handler = lambda method, url, body: http_error(400)
+
+    try:
+        cache.apply(1, 'price', 200)
+    except Exception:
+        pass
+    assert cache.get(1) is None
@@ -0,0 +1,130 @@
+import datetime
+
+from coupang.pagination import (
+        page_items, iter_items, iter_items_parallel, iter_windows,
+        date_windows, time_windows, now_kst)
+from coupang.product import get_products_by_query
+from coupang.rocketgrowth import get_rocketwarehouse_inventory
+from coupang.shipping import outbound_shipping_place
+from coupang.ordersheet import iter_ordersheets
+from coupang.records import InventorySummary, OrderSheet
+from conftest import query_of
+
+
+def test_page_items():
+    assert page_items({'data': [1, 2]}) == [1, 2]
+    assert page_items({'data': {'content': [3]}}) == [3]
+    assert page_items({'content': [4]}) == [4]
+    assert page_items({'data': {'x': [5]}}, items_key='x') == [5]
+    assert page_items({'data': None}) == []
+
+
+def test_iter_items_follows_next_token(client, fake):
+    def handler(method, url, body):
+        token = int(query_of(url).get('nextToken') or 1)
+        return {'code': 'SUCCESS', 'data': [token],
+                'nextToken': '' if token == 3 else str(token + 1)}
+    fake.handler = handler
+
+    items = list(iter_items(get_products_by_query, {'vendorId': 'A'},
+                            client=client))
+
+    assert items == [1, 2, 3]
+
+
+def test_iter_items_stops_on_repeated_token(client, fake):
+    fake.handler = lambda method, url, body: \
+            {'code': 'SUCCESS', 'data': [1], 'nextToken': 'same'}
+
+    assert list(iter_items(get_products_by_query, {'vendorId': 'A'},
+                           client=client)) == [1, 1]
+
+
+def test_iter_items_records(client, fake):
+    fake.handler = lambda method, url, body: {
+            'code': 200, 'nextToken': '',
+            'data': [{'vendorItemId': 9, 'salesCountMap': {}, 'new': 1}]}
+
+    items = list(iter_items(get_rocketwarehouse_inventory, {'vendorId': 'A'},
+                            client=client, records=True))
+
+    assert isinstance(items[0], InventorySummary)
+    assert items[0].vendorItemId == items[0]['vendorItemId'] == 9
+    assert items[0].extra == {'new': 1}
+    assert items[0].to_dict() == {'vendorItemId': 9, 'salesCountMap': {},
+                                  'new': 1}
+
+
+def test_iter_items_parallel_keeps_page_order(client, fake):
+    def handler(method, url, body):
+        page = int(query_of(url)['pageNum'])
+        return {'content': [page],
+                'pagination': {'currentPage': page, 'totalPages': 5}}
+    fake.handler = handler
+
+    items = list(iter_items_parallel(outbound_shipping_place,
+                                     {'pageSize': 50}, workers=3,
+                                     client=client))
+
+    assert items == [1, 2, 3, 4, 5]
+
+
+def test_date_windows():
+    assert list(date_windows('2024-01-01', '2024-01-10', 4)) == [
+            ('2024-01-01', '2024-01-04'), ('2024-01-05', '2024-01-08'),
+            ('2024-01-09', '2024-01-10')]
+
+
+def test_time_windows_share_boundaries():
+    windows = list(time_windows('2024-01-01T00:00', '2024-01-01T05:00',
+                                datetime.timedelta(hours=2)))
+
+    assert windows == [('2024-01-01T00:00', '2024-01-01T02:00'),
+                       ('2024-01-01T02:00', '2024-01-01T04:00'),
+                       ('2024-01-01T04:00', '2024-01-01T05:00')]
+
+
+def test_iter_windows_order_and_dedupe():
+    def fetch(window):
+        # 앞 구간의 마지막 항목이 다음 구간에도 다시 나온다
+        return [window - 1, window] if window else [window]
+
+    items = list(iter_windows(fetch, range(6), workers=3, key=lambda x: x))
+
+    assert items == [0, 1, 2, 3, 4, 5]
+
+
+def test_iter_windows_done_called_in_order():
+    done = []
+    list(iter_windows(lambda w: [w], range(5), workers=2, done=done.append))
+
+    assert done == [0, 1, 2, 3, 4]
+
+
+def test_iter_ordersheets_splits_and_dedupes(client, fake):
+    def handler(method, url, body):
+        query = query_of(url)
+        # 구간마다 발주서 하나, 시작일 발주서는 앞 구간 경계에도 걸린다
+        sheets = [{'shipmentBoxId': query['createdAtFrom'],
+                   'orderedAt': query['createdAtFrom']},
+                  {'shipmentBoxId': query['createdAtTo'],
+                   'orderedAt': query['createdAtTo']}]
+        return {'code': 200, 'nextToken': '', 'data': sheets}
+    fake.handler = handler
+
+    sheets = list(iter_ordersheets('ACCEPT', '2024-01-01', '2024-03-31',
+                                   client=client, records=True))
+
+    assert all(isinstance(s, OrderSheet) for s in sheets)
+    ids = [s.shipmentBoxId for s in sheets]
+    assert len(ids) == len(set(ids))
+    assert ids == sorted(ids)
+    assert all(q['createdAtTo'] <= '2024-03-31' for q in fake.queries())
+    assert len(fake.requests) == 3
+
+
+def test_now_kst_is_nine_hours_ahead_of_utc():
+    utc = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+    assert abs((now_kst() - utc) - datetime.timedelta(hours=9)) \
+            < datetime.timedelta(seconds=5)
@@ -0,0 +1,63 @@
+import pytest
+
+from coupang.common import RateLimiter, CoupangClient, coupang
+
+
+@coupang
+def get_unlimited(path):
+    return {'method': "GET", 'path': "/v2/unlimited", 'group': 'custom'}
+
+
+def test_burst_then_wait():
+    limiter = RateLimiter(10, burst=3)
+
+    waits = [limiter.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0, 0, 0]
+    assert 0.05 < waits[3] <= 0.1
+    assert 0.15 < waits[4] <= 0.2
+
+
+def test_set_rate_limit_changes_existing_limiter():
+    client = CoupangClient('a', 's', 'V')
+    limiter = client.rate_limiter('group', 5)
+
+    client.set_rate_limit('group', 50)
+
+    assert client.rate_limiter('group') is limiter
+    assert (limiter.rate, limiter.burst) == (50, 50)
+
+
+def test_rate_limiter_without_rate_needs_existing_group():
+    client = CoupangClient('a', 's', 'V')
+
+    with pytest.raises(ValueError):
+        client.rate_limiter('vendor-items')
+    assert 'vendor-items' not in client.limiters
+
+    client.set_rate_limit('vendor-items', 10)
+    assert client.rate_limiter('vendor-items').rate == 10
+
+
+def test_limiter_for_undeclared_rate_uses_group_limit():
+    client = CoupangClient('a', 's', 'V')
+    assert client.limiter_for(get_unlimited) is None
+
+    client.set_rate_limit('get_unlimited', 3)
+
+    assert client.limiter_for(get_unlimited).rate == 3
+
+
+def test_rate_limit_scope_restores_previous_limit():
+    client = CoupangClient('a', 's', 'V')
+
+    with client.rate_limit('new', 5) as limiter:
+        assert client.limiters['new'] is limiter
+    assert 'new' not in client.limiters
+
+    client.set_rate_limit('old', 7)
+    previous = client.limiters['old']
+    with client.rate_limit('old', 100):
+        assert client.limiters['old'].rate == 100
+    assert client.limiters['old'] is previous
+    assert previous.rate == 7
@@ -0,0 +1,44 @@
+import datetime
+import json
+import os
+
+from coupang.product import scan_products_by_time_frame
+from conftest import query_of
+
+
+def products_handler(fake):
+    '''30분마다 상품이 하나씩 등록된 것처럼 응답'''
+
+    def handler(method, url, body):
+        query = query_of(url)
+        start = datetime.datetime.fromisoformat(query['createdAtFrom'])
+        end = datetime.datetime.fromisoformat(query['createdAtTo'])
+        assert end - start <= datetime.timedelta(minutes=10)
+        data = []
+        t = datetime.datetime(2024, 1, 1)
+        while t < datetime.datetime(2024, 1, 1, 6):
+            if start <= t <= end:
+                data.append({'sellerProductId': int(t.timestamp())})
+            t += datetime.timedelta(minutes=30)
+        return {'code': 'SUCCESS', 'data': data}
+    return handler
+
+
+def test_scan_resumes_and_removes_checkpoint(client, fake, tmp_path):
+    fake.handler = products_handler(fake)
+    checkpoint = str(tmp_path / 'scan.json')
+    scan = lambda: scan_products_by_time_frame(
+            '2024-01-01T00:00', '2024-01-01T06:00', checkpoint=checkpoint,
+            workers=2, client=client)
+
+    run = scan()
+    first = [next(run)['sellerProductId'] for _ in range(4)]
+    run.close()
+    saved = json.load(open(checkpoint))
+    assert '2024-01-01T01:00:00' <= saved['next'] < '2024-01-01T06:00:00'
+
+    rest = [p['sellerProductId'] for p in scan()]
+    assert set(first + rest) == {p['sellerProductId']
+                                 for p in scan()}
+    assert len(set(first + rest)) == 12
+    assert not os.path.exists(checkpoint)
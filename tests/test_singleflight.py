@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from coupang.common import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return {'n': len(calls)}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(
+            flight.do('k', fetch)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(
+            flight.do('k', fetch))) for _ in range(4)]
+    for t in followers:
+        t.start()
+    for t in [leader] + followers:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(r == {'n': 1} for r in results)
+    # 함께 기다린 호출은 각자 복사본을 받는다
+    assert len({id(r) for r in results}) == 5
+    assert flight._flights == {}
+
+
+def test_error_is_shared_and_next_call_runs_again():
+    flight = SingleFlight()
+
+    with pytest.raises(ZeroDivisionError):
+        flight.do('k', lambda: 1 / 0)
+    assert flight.do('k', lambda: 'ok') == 'ok'
+
+
+def test_async_calls_share_one_request():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {'data': ['ok']}
+
+    async def main():
+        return await asyncio.gather(*[flight.do_async('k', fetch)
+                                      for _ in range(5)])
+
+    results = asyncio.run(main())
+    assert results == [{'data': ['ok']}] * 5
+    assert len(calls) == 1
+    results[0]['data'].append('changed')
+    assert all(r == {'data': ['ok']} for r in results[1:])
+
+
+def test_async_leader_cancellation_does_not_cancel_followers():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return 'ok'
+
+    async def main():
+        leader = asyncio.ensure_future(asyncio.wait_for(
+                flight.do_async('k', fetch), 0.02))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async('k', fetch))
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader, follower = asyncio.run(main())
+    assert isinstance(leader, asyncio.TimeoutError)
+    assert follower == 'ok'
+    assert len(calls) == 1
+    assert flight._flights == {}
+
+
+def test_async_error_is_shared():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError('x')
+
+    async def main():
+        return await asyncio.gather(flight.do_async('k', fail),
+                                    flight.do_async('k', fail),
+                                    return_exceptions=True)
+
+    assert [type(r) for r in asyncio.run(main())] == [ValueError] * 2
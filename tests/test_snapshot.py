@@ -0,0 +1,38 @@
+from coupang.snapshot import Snapshot
+
+
+def test_snapshot_accepts_string_ids():
+    snapshot = Snapshot()
+    snapshot.add('3000', {'amountInStock': '5', 'salePrice': 100,
+                          'onSale': True})
+    snapshot.add(3000, {'amountInStock': 6, 'salePrice': 100})
+
+    assert len(snapshot) == 1
+    assert snapshot.get('3000') == {'amountInStock': 6, 'salePrice': 100,
+                                    'onSale': False}
+
+
+def test_snapshot_add_failure_leaves_table_unchanged():
+    snapshot = Snapshot()
+    for bad in [('x', {}), (1, {'amountInStock': 'many'})]:
+        try:
+            snapshot.add(*bad)
+        except ValueError:
+            pass
+
+    assert len(snapshot) == 0 and snapshot.index == {}
+    assert len(snapshot.stock) == len(snapshot.price) == 0
+
+
+def test_snapshot_diff():
+    before, after = Snapshot(), Snapshot()
+    for i in range(20):
+        before.add(i, {'amountInStock': i, 'salePrice': 100, 'onSale': True})
+        after.add(i, {'amountInStock': i, 'salePrice': 100,
+                      'onSale': i != 9})
+    after.add(3, {'amountInStock': 0, 'salePrice': 100, 'onSale': True})
+
+    changed = [(i, a['amountInStock'], b['onSale'])
+               for i, a, b in before.diff(after)]
+
+    assert changed == [(3, 3, True), (9, 9, False)]